@@ -0,0 +1,116 @@
+import re
+from flask import Blueprint, Response, request, jsonify, current_app
+
+from bundles import body_etag, encode_json, negotiate_language
+
+content_bp = Blueprint('content', __name__)
+
+SECTION_RE = re.compile(r'[\w-]+\Z')
+
+
+@content_bp.route('/content', methods=['GET'])
+def get_negotiated_bundle():
+    """Every section of the best language for Accept-Language (or ?lang=)"""
+    manager = get_content_manager()
+    language = request.args.get('lang') or negotiate_language(
+        request.accept_languages, manager.supported_languages, manager.default_language)
+    if language not in manager.supported_languages:
+        return jsonify({'error': f'Unsupported language: {language}'}), 404
+
+    response = bundle_response(language)
+    response.vary.add('Accept-Language')
+    return response
+
+
+@content_bp.route('/content/search', methods=['GET'])
+def search_content():
+    """Ranked sections matching ?q= in ?lang= (or the Accept-Language choice)"""
+    manager = get_content_manager()
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    language = request.args.get('lang') or negotiate_language(
+        request.accept_languages, manager.supported_languages, manager.default_language)
+    if language not in manager.supported_languages:
+        return jsonify({'error': f'Unsupported language: {language}'}), 404
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+
+    try:
+        total, results = manager.search(query, language, limit)
+        response = jsonify({
+            'success': True,
+            'query': query,
+            'language': language,
+            'total': total,
+            'results': results
+        })
+        if 'lang' not in request.args:
+            response.vary.add('Accept-Language')
+        return response, 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error searching content: {str(e)}")
+        return jsonify({'error': 'Failed to search content'}), 500
+
+
+@content_bp.route('/content/<language>', methods=['GET'])
+def get_bundle(language):
+    """Every section of one language, rendered, in one cacheable response"""
+    if language not in get_content_manager().supported_languages:
+        return jsonify({'error': f'Unsupported language: {language}'}), 404
+    return bundle_response(language)
+
+
+@content_bp.route('/content/<language>/<section>', methods=['GET'])
+def get_section(language, section):
+    """One section's metadata, Markdown source and rendered HTML"""
+    manager = get_content_manager()
+    if language not in manager.supported_languages:
+        return jsonify({'error': f'Unsupported language: {language}'}), 404
+    if not SECTION_RE.match(section):
+        return jsonify({'error': 'Invalid section name'}), 400
+
+    try:
+        content = manager.get_content(section, language)
+        if content is None:
+            return jsonify({'error': 'Section not found'}), 404
+        body = encode_json(dict(content, section=section, language=language))
+        return cacheable(body, body_etag(body), language)
+
+    except Exception as e:
+        current_app.logger.error(f"Error loading section {section} ({language}): {str(e)}")
+        return jsonify({'error': 'Failed to load content'}), 500
+
+
+def bundle_response(language: str) -> Response:
+    try:
+        body, etag = get_content_bundles().get(language)
+    except Exception as e:
+        current_app.logger.error(f"Error building {language} content bundle: {str(e)}")
+        # A Response rather than a tuple: callers add Vary to it
+        response = jsonify({'error': 'Failed to load content'})
+        response.status_code = 500
+        return response
+    return cacheable(body, etag, language)
+
+
+def cacheable(body: bytes, etag: str, language: str) -> Response:
+    """Prebuilt JSON that clients revalidate with If-None-Match"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Content-Language'] = language
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def get_content_manager():
+    """Import content_manager from app module"""
+    from app import content_manager
+    return content_manager
+
+
+def get_content_bundles():
+    """Import content_bundles from app module"""
+    from app import content_bundles
+    return content_bundles
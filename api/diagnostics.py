@@ -0,0 +1,245 @@
+import gc
+import os
+import sys
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import Blueprint, request, jsonify, current_app
+
+from api.events import auth_required
+
+diagnostics_bp = Blueprint('diagnostics', __name__)
+
+# Snapshots live in the worker that took them; keep only the most recent few
+MAX_SNAPSHOTS = 10
+GROUP_BY_OPTIONS = ('lineno', 'filename', 'traceback')
+_snapshots: 'OrderedDict[str, tracemalloc.Snapshot]' = OrderedDict()
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+@diagnostics_bp.route('/debug/memory', methods=['GET'])
+@auth_required
+def memory_status():
+    """Worker memory, gc and tracing status (admin only)"""
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'process': process_memory(),
+        'gc': gc_status(),
+        'tracemalloc': tracing_status(),
+        'snapshots': list(_snapshots.keys())
+    }), 200
+
+
+@diagnostics_bp.route('/debug/memory/start', methods=['POST'])
+@auth_required
+def start_tracing():
+    """Start tracemalloc tracing (admin only)"""
+    data = request.get_json(silent=True) or {}
+    try:
+        frames = int(data.get('frames', 1))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'frames must be an integer'}), 400
+
+    if frames < 1 or frames > 64:
+        return jsonify({'error': 'frames must be between 1 and 64'}), 400
+
+    if tracemalloc.is_tracing():
+        return jsonify({'error': 'Tracing already started'}), 409
+
+    tracemalloc.start(frames)
+    current_app.logger.info(
+        f"tracemalloc started by {request.current_user} ({frames} frames)")
+    return jsonify({
+        'success': True,
+        'tracemalloc': tracing_status()
+    }), 200
+
+
+@diagnostics_bp.route('/debug/memory/stop', methods=['POST'])
+@auth_required
+def stop_tracing():
+    """Stop tracemalloc tracing and drop stored snapshots (admin only)"""
+    if not tracemalloc.is_tracing():
+        return jsonify({'error': 'Tracing is not running'}), 409
+
+    tracemalloc.stop()
+    _snapshots.clear()
+    current_app.logger.info(f"tracemalloc stopped by {request.current_user}")
+    return jsonify({
+        'success': True,
+        'tracemalloc': tracing_status()
+    }), 200
+
+
+@diagnostics_bp.route('/debug/memory/snapshot', methods=['POST'])
+@auth_required
+def take_snapshot():
+    """Take and store a named allocation snapshot (admin only)"""
+    if not tracemalloc.is_tracing():
+        return jsonify({'error': 'Tracing is not running'}), 409
+
+    data = request.get_json(silent=True) or {}
+    name = str(data.get('name') or datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f'))
+
+    _snapshots.pop(name, None)
+    _snapshots[name] = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+
+    return jsonify({
+        'success': True,
+        'snapshot': name,
+        'snapshots': list(_snapshots.keys())
+    }), 201
+
+
+@diagnostics_bp.route('/debug/memory/top', methods=['GET'])
+@auth_required
+def top_allocations():
+    """Top allocation sites of a stored or fresh snapshot (admin only)"""
+    if not tracemalloc.is_tracing():
+        return jsonify({'error': 'Tracing is not running'}), 409
+
+    group_by, limit, error = _parse_stat_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    name = request.args.get('snapshot')
+    if name:
+        snapshot = _snapshots.get(name)
+        if snapshot is None:
+            return jsonify({'error': f'Unknown snapshot: {name}'}), 404
+    else:
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    stats = snapshot.statistics(group_by)
+    return jsonify({
+        'success': True,
+        'group_by': group_by,
+        'total_bytes': sum(stat.size for stat in stats),
+        'top': [_format_stat(stat) for stat in stats[:limit]],
+        'process': process_memory(),
+        'gc': gc_status()
+    }), 200
+
+
+@diagnostics_bp.route('/debug/memory/diff', methods=['GET'])
+@auth_required
+def diff_snapshots():
+    """Compare two stored snapshots (admin only)"""
+    group_by, limit, error = _parse_stat_args()
+    if error:
+        return jsonify({'error': error}), 400
+
+    old_name = request.args.get('from')
+    new_name = request.args.get('to')
+    if not old_name or not new_name:
+        return jsonify({'error': 'Both from and to snapshots are required'}), 400
+
+    missing = [n for n in (old_name, new_name) if n not in _snapshots]
+    if missing:
+        return jsonify({'error': f'Unknown snapshot: {", ".join(missing)}'}), 404
+
+    stats = _snapshots[new_name].compare_to(_snapshots[old_name], group_by)
+    return jsonify({
+        'success': True,
+        'group_by': group_by,
+        'from': old_name,
+        'to': new_name,
+        'size_diff_bytes': sum(stat.size_diff for stat in stats),
+        'top': [_format_stat_diff(stat) for stat in stats[:limit]],
+        'process': process_memory(),
+        'gc': gc_status()
+    }), 200
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this worker in bytes"""
+    rss = None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    peak_rss = None
+    try:
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        if sys.platform != 'darwin':
+            peak_rss *= 1024
+    except (ImportError, OSError):
+        pass
+
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak_rss}
+
+
+def gc_status() -> Dict:
+    """Garbage collector generation counts and collection totals"""
+    return {
+        'counts': list(gc.get_count()),
+        'thresholds': list(gc.get_threshold()),
+        'collections': [s['collections'] for s in gc.get_stats()],
+        'collected': [s['collected'] for s in gc.get_stats()],
+        'objects': len(gc.get_objects())
+    }
+
+
+def tracing_status() -> Dict:
+    """tracemalloc state and traced memory totals"""
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'tracing': True,
+        'frames': tracemalloc.get_traceback_limit(),
+        'traced_bytes': current,
+        'traced_peak_bytes': peak,
+        'overhead_bytes': tracemalloc.get_tracemalloc_memory()
+    }
+
+
+def _parse_stat_args():
+    group_by = request.args.get('group_by', 'lineno')
+    if group_by not in GROUP_BY_OPTIONS:
+        return None, None, f'group_by must be one of: {", ".join(GROUP_BY_OPTIONS)}'
+
+    try:
+        limit = int(request.args.get('limit', 25))
+    except ValueError:
+        return None, None, 'limit must be an integer'
+
+    return group_by, max(1, min(limit, 500)), None
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> List[str]:
+    return [f'{frame.filename}:{frame.lineno}' for frame in traceback]
+
+
+def _format_stat(stat: tracemalloc.Statistic) -> Dict:
+    return {
+        'site': _format_traceback(stat.traceback),
+        'size_bytes': stat.size,
+        'count': stat.count
+    }
+
+
+def _format_stat_diff(stat: tracemalloc.StatisticDiff) -> Dict:
+    return {
+        'site': _format_traceback(stat.traceback),
+        'size_bytes': stat.size,
+        'size_diff_bytes': stat.size_diff,
+        'count': stat.count,
+        'count_diff': stat.count_diff
+    }
@@ -1,12 +1,27 @@
 import os
+import json
+import base64
 from datetime import datetime
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
+from flask import Blueprint, Response, request, jsonify, send_from_directory, current_app
 from werkzeug.utils import secure_filename
 from functools import wraps
 
+from participants import GZIP_TYPES, CSVImportError, read_participant_csv, validate_participant
+from projection import compile_projection
+from store import Unchanged
+
 events_bp = Blueprint('events', __name__)
 
 
+class OperationError(Exception):
+    """Rejects a request from inside a store transaction, so nothing is saved"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
 def auth_required(f):
     """Decorator to protect endpoints with JWT authentication"""
     @wraps(f)
@@ -47,9 +62,14 @@ def get_events():
         for event in events:
             event['display_image_url'] = get_event_image_url(event)
 
+        events = events[:4]  # Always return max 4 events
+        project = get_projection()
+        if project:
+            events = [project(event) for event in events]
+
         return jsonify({
             'success': True,
-            'events': events[:4]  # Always return max 4 events
+            'events': events
         }), 200
 
     except Exception as e:
@@ -57,6 +77,23 @@ def get_events():
         return jsonify({'error': 'Failed to load events'}), 500
 
 
+@events_bp.route('/events/stream', methods=['GET'])
+def stream_events():
+    """Live participant counts and event updates as Server-Sent Events (public)"""
+    broker = get_stream_broker()
+    # Counted from here, so concurrent requests cannot overshoot max_clients
+    release = broker.reserve()
+    if release is None:
+        return jsonify({'error': 'Too many open event streams'}), 503
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    response = Response(broker.stream(release, last_event_id), mimetype='text/event-stream')
+    response.call_on_close(release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @events_bp.route('/events/<int:event_id>', methods=['GET'])
 def get_event(event_id):
     """Get a specific event"""
@@ -71,10 +108,11 @@ def get_event(event_id):
             return jsonify({'error': 'Event not found'}), 404
 
         event['display_image_url'] = get_event_image_url(event)
+        project = get_projection()
 
         return jsonify({
             'success': True,
-            'event': event
+            'event': project(event) if project else event
         }), 200
 
     except Exception as e:
@@ -94,33 +132,19 @@ def update_event(event_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        events = load_events()
-        event = next((e for e in events if e.get('id') == event_id), None)
-
-        if not event:
-            return jsonify({'error': 'Event not found'}), 404
-
-        # Update allowed fields
-        if 'title' in data:
-            event['title'] = data['title'].strip()
-        if 'description' in data:
-            event['description'] = data['description'].strip()
-        if 'banner_url' in data:
-            event['banner_url'] = data['banner_url'].strip()
+        with events_transaction() as events:
+            event = apply_update(events, event_id, data)
 
-        event['updated_at'] = datetime.utcnow().isoformat()
-
-        if save_events(events):
-            event['display_image_url'] = get_event_image_url(event)
-            current_app.logger.info(
-                f"Event {event_id} updated by {request.current_user}")
-            return jsonify({
-                'success': True,
-                'event': event
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to save event'}), 500
+        event['display_image_url'] = get_event_image_url(event)
+        current_app.logger.info(
+            f"Event {event_id} updated by {request.current_user}")
+        return jsonify({
+            'success': True,
+            'event': event
+        }), 200
 
+    except OperationError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         current_app.logger.error(f"Error updating event {event_id}: {str(e)}")
         return jsonify({'error': 'Failed to update event'}), 500
@@ -134,42 +158,21 @@ def reset_event(event_id):
         return jsonify({'error': 'Event ID must be between 1 and 4'}), 400
 
     try:
-        events = load_events()
-        event = next((e for e in events if e.get('id') == event_id), None)
-
-        if not event:
-            return jsonify({'error': 'Event not found'}), 404
-
-        # Remove uploaded image file if exists
-        if event.get('uploaded_image'):
-            old_path = os.path.join(
-                current_app.config['UPLOAD_FOLDER'], event['uploaded_image'])
-            if os.path.exists(old_path):
-                os.remove(old_path)
-                current_app.logger.info(f"Removed uploaded image: {old_path}")
-
-        # Reset to default values
-        default_image_url = event.get('default_image_url', '')
-        event.update({
-            'title': f'Event {event_id}',
-            'description': f'Beschreibung für Event {event_id}',
-            'banner_url': default_image_url,
-            'uploaded_image': '',
-            'participants': [],
-            'updated_at': datetime.utcnow().isoformat()
-        })
+        removed_files = []
+        with events_transaction() as events:
+            event = apply_reset(events, event_id, removed_files)
+        remove_uploads(removed_files)
 
-        if save_events(events):
-            event['display_image_url'] = get_event_image_url(event)
-            current_app.logger.info(
-                f"Event {event_id} reset by {request.current_user}")
-            return jsonify({
-                'success': True,
-                'event': event
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to save event'}), 500
+        event['display_image_url'] = get_event_image_url(event)
+        current_app.logger.info(
+            f"Event {event_id} reset by {request.current_user}")
+        return jsonify({
+            'success': True,
+            'event': event
+        }), 200
 
+    except OperationError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         current_app.logger.error(f"Error resetting event {event_id}: {str(e)}")
         return jsonify({'error': 'Failed to reset event'}), 500
@@ -183,6 +186,26 @@ def get_participants(event_id):
         return jsonify({'error': 'Event ID must be between 1 and 4'}), 400
 
     try:
+        project = get_projection()
+
+        query = request.args.get('q', '').strip()
+        if query:
+            # Only the matches are read, so the store's lists are not copied
+            if event_id not in get_event_counts():
+                return jsonify({'error': 'Event not found'}), 404
+            page, per_page = parse_pagination()
+            total, hits, truncated = get_participant_index().search(
+                query, event_id, (page - 1) * per_page, per_page)
+            matches = [participant for _, participant in hits]
+            return jsonify({
+                'success': True,
+                'participants': [project(p) for p in matches] if project else matches,
+                'count': total,
+                'truncated': truncated,
+                'page': page,
+                'per_page': per_page
+            }), 200
+
         events = load_events()
         event = next((e for e in events if e.get('id') == event_id), None)
 
@@ -190,10 +213,9 @@ def get_participants(event_id):
             return jsonify({'error': 'Event not found'}), 404
 
         participants = event.get('participants', [])
-
         return jsonify({
             'success': True,
-            'participants': participants,
+            'participants': [project(p) for p in participants] if project else participants,
             'count': len(participants)
         }), 200
 
@@ -203,6 +225,71 @@ def get_participants(event_id):
         return jsonify({'error': 'Failed to load participants'}), 500
 
 
+@events_bp.route('/participants', methods=['GET'])
+@auth_required
+def list_all_participants():
+    """Participants of all events, newest first, cursor-paginated (admin only)"""
+    event_id = request.args.get('event_id', type=int)
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+
+    cursor = None
+    if request.args.get('cursor'):
+        cursor = decode_cursor(request.args['cursor'])
+        if cursor is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    try:
+        refresh_store()
+        timeline = get_participant_timeline()
+        rows, next_cursor = timeline.page(cursor, limit, event_id)
+        project = get_projection()
+
+        participants = [dict(participant, event_id=eid) for eid, participant in rows]
+        return jsonify({
+            'success': True,
+            'participants': [project(p) for p in participants] if project else participants,
+            'count': timeline.count(event_id),
+            'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error listing participants: {str(e)}")
+        return jsonify({'error': 'Failed to load participants'}), 500
+
+
+@events_bp.route('/participants/search', methods=['GET'])
+@auth_required
+def search_participants():
+    """Search participants of all events by name, email or message (admin only)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Search query is required'}), 400
+
+    event_id = request.args.get('event_id', type=int)
+    page, per_page = parse_pagination()
+
+    try:
+        refresh_store()
+        total, hits, truncated = get_participant_index().search(
+            query, event_id, (page - 1) * per_page, per_page)
+
+        return jsonify({
+            'success': True,
+            'participants': [
+                dict(participant, event_id=hit_event_id)
+                for hit_event_id, participant in hits
+            ],
+            'count': total,
+            'truncated': truncated,
+            'page': page,
+            'per_page': per_page
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error searching participants: {str(e)}")
+        return jsonify({'error': 'Failed to search participants'}), 500
+
+
 @events_bp.route('/events/<int:event_id>/participants', methods=['POST'])
 def add_participant(event_id):
     """Add a participant to an event (public endpoint)"""
@@ -214,54 +301,89 @@ def add_participant(event_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        # Validate required fields
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
+        # Append under the store lock so concurrent sign-ups are not lost
+        with events_transaction() as events:
+            participant = apply_add_participant(events, event_id, data)
 
-        if not name or not email:
-            return jsonify({'error': 'Name and email are required'}), 400
-
-        # Basic email validation
-        if '@' not in email or '.' not in email:
-            return jsonify({'error': 'Invalid email format'}), 400
+        current_app.logger.info(
+            f"New participant {participant['name']} added to event {event_id}")
+        return jsonify({
+            'success': True,
+            'participant': participant,
+            'message': 'Successfully registered for the event'
+        }), 201
 
-        events = load_events()
-        event = next((e for e in events if e.get('id') == event_id), None)
+    except OperationError as e:
+        return jsonify({'error': e.message}), e.status
+    except Exception as e:
+        current_app.logger.error(
+            f"Error adding participant to event {event_id}: {str(e)}")
+        return jsonify({'error': 'Failed to add participant'}), 500
 
-        if not event:
-            return jsonify({'error': 'Event not found'}), 404
 
-        # Create participant object
-        participant = {
-            'name': name,
-            'email': email,
-            'message': data.get('message', '').strip(),
-            'timestamp': datetime.utcnow().isoformat(),
-            'event_id': event_id
-        }
+@events_bp.route('/events/<int:event_id>/participants/import', methods=['POST'])
+@auth_required
+def import_participants(event_id):
+    """Import participants from a CSV upload, optionally gzipped (admin only)"""
+    if event_id < 1 or event_id > 4:
+        return jsonify({'error': 'Event ID must be between 1 and 4'}), 400
 
-        # Add to event's participants list
-        if 'participants' not in event:
-            event['participants'] = []
+    # Either a multipart "file" field or the CSV as the raw request body
+    upload = request.files.get('file')
+    if upload:
+        stream, filename, mimetype = upload.stream, upload.filename or '', upload.mimetype
+    elif request.mimetype in GZIP_TYPES or request.mimetype.startswith('text/'):
+        stream, filename, mimetype = request.stream, '', request.mimetype
+    else:
+        return jsonify({'error': 'No CSV file provided'}), 400
 
-        event['participants'].append(participant)
-        event['updated_at'] = datetime.utcnow().isoformat()
+    gzipped = (filename.lower().endswith('.gz') or mimetype in GZIP_TYPES
+               or request.headers.get('Content-Encoding') == 'gzip')
 
-        if save_events(events):
-            current_app.logger.info(
-                f"New participant {name} added to event {event_id}")
-            return jsonify({
-                'success': True,
-                'participant': participant,
-                'message': 'Successfully registered for the event'
-            }), 201
-        else:
-            return jsonify({'error': 'Failed to save participant'}), 500
+    try:
+        events = load_events()
+        event = next((e for e in events if e.get('id') == event_id), None)
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
 
+        known_emails = {p.get('email', '').casefold() for p in event.get('participants', [])}
+        report = read_participant_csv(
+            stream, gzipped, known_emails,
+            max_rows=current_app.config['IMPORT_MAX_ROWS'],
+            max_errors=current_app.config['IMPORT_MAX_ERRORS'])
+
+        imported = 0
+        if report.accepted:
+            now = datetime.utcnow().isoformat()
+            with events_transaction() as events:
+                event = find_event(events, event_id)
+                participants = event.setdefault('participants', [])
+                # Registrations may have arrived while the file was parsed
+                registered = {p.get('email', '').casefold() for p in participants}
+                for line, fields in report.accepted:
+                    if fields['email'].casefold() in registered:
+                        report.reject(line, 'Email already registered')
+                        continue
+                    participants.append(dict(fields, timestamp=fields.get('timestamp', now),
+                                             event_id=event_id))
+                    imported += 1
+                if not imported:
+                    raise Unchanged()
+                event['updated_at'] = now
+
+        current_app.logger.info(
+            f"Imported {imported} participants into event {event_id} "
+            f"({report.rejected} rejected) by {request.current_user}")
+        return jsonify(dict(report.to_dict(), success=True, imported=imported)), 200
+
+    except CSVImportError as e:
+        return jsonify({'error': str(e)}), 400
+    except OperationError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         current_app.logger.error(
-            f"Error adding participant to event {event_id}: {str(e)}")
-        return jsonify({'error': 'Failed to add participant'}), 500
+            f"Error importing participants for event {event_id}: {str(e)}")
+        return jsonify({'error': 'Failed to import participants'}), 500
 
 
 @events_bp.route('/events/<int:event_id>/export', methods=['GET'])
@@ -318,6 +440,58 @@ def export_participants(event_id):
         return jsonify({'error': 'Failed to export participants'}), 500
 
 
+@events_bp.route('/batch', methods=['POST'])
+@auth_required
+def batch_operations():
+    """Apply several event operations in one atomic commit (admin only)
+
+    Body: {"operations": [{"op": "update", "event_id": 1, "data": {...}},
+    {"op": "reset" | "remove-image", "event_id": 2},
+    {"op": "add-participant", "event_id": 3, "data": {...}}]}
+
+    Operations run in order against one snapshot of the store. If any of
+    them fails, nothing is saved and the failing index is reported.
+    """
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'A non-empty operations list is required'}), 400
+
+    max_operations = current_app.config['BATCH_MAX_OPERATIONS']
+    if len(operations) > max_operations:
+        return jsonify({'error': f'At most {max_operations} operations per batch'}), 400
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get('op') not in BATCH_OPERATIONS:
+            allowed = ', '.join(BATCH_OPERATIONS)
+            return jsonify({'error': f'Unknown operation (allowed: {allowed})',
+                            'index': index}), 400
+        if not isinstance(operation.get('event_id'), int) or not 1 <= operation['event_id'] <= 4:
+            return jsonify({'error': 'Event ID must be between 1 and 4', 'index': index}), 400
+
+    index = 0
+    try:
+        removed_files = []
+        results = []
+        with events_transaction() as events:
+            for index, operation in enumerate(operations):
+                results.append(apply_operation(events, operation, removed_files))
+        remove_uploads(removed_files)
+
+        current_app.logger.info(
+            f"Batch of {len(operations)} operations applied by {request.current_user}")
+        return jsonify({
+            'success': True,
+            'results': results
+        }), 200
+
+    except OperationError as e:
+        return jsonify({'error': e.message, 'index': index}), e.status
+    except Exception as e:
+        current_app.logger.error(f"Error applying batch operations: {str(e)}")
+        return jsonify({'error': 'Failed to apply batch operations'}), 500
+
+
 @events_bp.route('/uploads/<filename>')
 def uploaded_file(filename):
     """Serve uploaded files"""
@@ -354,41 +528,32 @@ def upload_event_image(event_id):
             # Save file
             file.save(filepath)
 
-            # Update event
-            events = load_events()
-            event = next((e for e in events if e.get('id') == event_id), None)
-
-            if not event:
-                # Clean up uploaded file if event not found
+            # Point the event at the new file; the old one goes after the commit
+            removed_files = []
+            try:
+                with events_transaction() as events:
+                    event = find_event(events, event_id)
+                    if event.get('uploaded_image') not in ('', None, filename):
+                        removed_files.append(event['uploaded_image'])
+                    event['uploaded_image'] = filename
+                    event['updated_at'] = datetime.utcnow().isoformat()
+            except Exception:
+                # Clean up the new file if the event could not be saved
                 os.remove(filepath)
-                return jsonify({'error': 'Event not found'}), 404
+                raise
+            remove_uploads(removed_files)
 
-            # Remove old uploaded image if exists
-            if event.get('uploaded_image'):
-                old_path = os.path.join(
-                    current_app.config['UPLOAD_FOLDER'], event['uploaded_image'])
-                if os.path.exists(old_path):
-                    os.remove(old_path)
-                    current_app.logger.info(f"Removed old image: {old_path}")
-
-            # Update event with new image
-            event['uploaded_image'] = filename
-            event['updated_at'] = datetime.utcnow().isoformat()
-
-            if save_events(events):
-                image_url = get_event_image_url(event)
-                current_app.logger.info(
-                    f"Image uploaded for event {event_id}: {filename}")
-                return jsonify({
-                    'success': True,
-                    'filename': filename,
-                    'image_url': image_url
-                }), 200
-            else:
-                # Clean up if save failed
-                os.remove(filepath)
-                return jsonify({'error': 'Failed to save event'}), 500
+            image_url = get_event_image_url(event)
+            current_app.logger.info(
+                f"Image uploaded for event {event_id}: {filename}")
+            return jsonify({
+                'success': True,
+                'filename': filename,
+                'image_url': image_url
+            }), 200
 
+        except OperationError as e:
+            return jsonify({'error': e.message}), e.status
         except Exception as e:
             current_app.logger.error(
                 f"Error uploading image for event {event_id}: {str(e)}")
@@ -408,39 +573,126 @@ def remove_event_image(event_id):
         return jsonify({'error': 'Event ID must be between 1 and 4'}), 400
 
     try:
-        events = load_events()
-        event = next((e for e in events if e.get('id') == event_id), None)
-
-        if not event:
-            return jsonify({'error': 'Event not found'}), 404
+        removed_files = []
+        with events_transaction() as events:
+            event = apply_remove_image(events, event_id, removed_files)
+        remove_uploads(removed_files)
 
-        # Remove uploaded image file if exists
-        if event.get('uploaded_image'):
-            old_path = os.path.join(
-                current_app.config['UPLOAD_FOLDER'], event['uploaded_image'])
-            if os.path.exists(old_path):
-                os.remove(old_path)
-                current_app.logger.info(f"Removed image: {old_path}")
-            event['uploaded_image'] = ''
-
-        event['updated_at'] = datetime.utcnow().isoformat()
-
-        if save_events(events):
-            event['display_image_url'] = get_event_image_url(event)
-            current_app.logger.info(f"Image removed from event {event_id}")
-            return jsonify({
-                'success': True,
-                'event': event
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to save event'}), 500
+        event['display_image_url'] = get_event_image_url(event)
+        current_app.logger.info(f"Image removed from event {event_id}")
+        return jsonify({
+            'success': True,
+            'event': event
+        }), 200
 
+    except OperationError as e:
+        return jsonify({'error': e.message}), e.status
     except Exception as e:
         current_app.logger.error(
             f"Error removing image from event {event_id}: {str(e)}")
         return jsonify({'error': 'Failed to remove image'}), 500
 
 
+# Store operations shared by the single-event routes and /batch. They
+# change the events list in place and raise OperationError to abort the
+# surrounding transaction; files are only deleted once the commit succeeded.
+def apply_update(events, event_id, data):
+    event = find_event(events, event_id)
+
+    # Update allowed fields
+    for field in ('title', 'description', 'banner_url'):
+        if field in data:
+            if not isinstance(data[field], str):
+                raise OperationError(f'{field} must be a string')
+            event[field] = data[field].strip()
+
+    event['updated_at'] = datetime.utcnow().isoformat()
+    return event
+
+
+def apply_reset(events, event_id, removed_files):
+    event = find_event(events, event_id)
+    if event.get('uploaded_image'):
+        removed_files.append(event['uploaded_image'])
+
+    # Reset to default values
+    default_image_url = event.get('default_image_url', '')
+    event.update({
+        'title': f'Event {event_id}',
+        'description': f'Beschreibung für Event {event_id}',
+        'banner_url': default_image_url,
+        'uploaded_image': '',
+        'participants': [],
+        'updated_at': datetime.utcnow().isoformat()
+    })
+    return event
+
+
+def apply_remove_image(events, event_id, removed_files):
+    event = find_event(events, event_id)
+    if event.get('uploaded_image'):
+        removed_files.append(event['uploaded_image'])
+        event['uploaded_image'] = ''
+
+    event['updated_at'] = datetime.utcnow().isoformat()
+    return event
+
+
+def apply_add_participant(events, event_id, data):
+    fields, error = validate_participant(data)
+    if error:
+        raise OperationError(error)
+
+    event = find_event(events, event_id)
+    participant = dict(fields, timestamp=datetime.utcnow().isoformat(),
+                       event_id=event_id)
+    event.setdefault('participants', []).append(participant)
+    event['updated_at'] = participant['timestamp']
+    return participant
+
+
+BATCH_OPERATIONS = ('update', 'reset', 'remove-image', 'add-participant')
+
+
+def apply_operation(events, operation, removed_files):
+    """Run one /batch operation and describe its result"""
+    op = operation['op']
+    event_id = operation['event_id']
+    data = operation.get('data')
+    if op in ('update', 'add-participant') and not isinstance(data, dict):
+        raise OperationError('No data provided')
+
+    if op == 'add-participant':
+        return {'op': op, 'event_id': event_id,
+                'participant': apply_add_participant(events, event_id, data)}
+
+    if op == 'update':
+        event = apply_update(events, event_id, data)
+    elif op == 'reset':
+        event = apply_reset(events, event_id, removed_files)
+    else:
+        event = apply_remove_image(events, event_id, removed_files)
+
+    # Participant lists are left out to keep batch responses small
+    summary = {k: v for k, v in event.items() if k != 'participants'}
+    summary['display_image_url'] = get_event_image_url(event)
+    summary['participant_count'] = len(event.get('participants', []))
+    return {'op': op, 'event_id': event_id, 'event': summary}
+
+
+def remove_uploads(filenames):
+    """Delete replaced or removed upload files after a successful commit"""
+    for filename in dict.fromkeys(filenames):
+        path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        try:
+            os.remove(path)
+            current_app.logger.info(f"Removed uploaded image: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            current_app.logger.warning(f"Could not remove {path}: {e}")
+
+
 # Helper functions that need to be imported from app
 def load_events():
     """Import load_events from app module"""
@@ -448,12 +700,6 @@ def load_events():
     return _load_events()
 
 
-def save_events(events):
-    """Import save_events from app module"""
-    from app import save_events as _save_events
-    return _save_events(events)
-
-
 def get_event_image_url(event):
     """Import get_event_image_url from app module"""
     from app import get_event_image_url as _get_event_image_url
@@ -464,3 +710,77 @@ def allowed_file(filename):
     """Import allowed_file from app module"""
     from app import allowed_file as _allowed_file
     return _allowed_file(filename)
+
+
+def events_transaction():
+    """Import events_transaction from app module"""
+    from app import events_transaction as _events_transaction
+    return _events_transaction()
+
+
+def find_event(events, event_id):
+    """Event with the given id, or an OperationError (404)"""
+    event = next((e for e in events if e.get('id') == event_id), None)
+    if not event:
+        raise OperationError('Event not found', 404)
+    return event
+
+
+def get_stream_broker():
+    """Import stream_broker from app module"""
+    from app import stream_broker
+    return stream_broker
+
+
+def get_projection():
+    """Cached projection for the request's ?fields= argument, if any"""
+    return compile_projection(request.args.get('fields', ''))
+
+
+def parse_pagination(default_per_page: int = 20, max_per_page: int = 100):
+    """Read page and per_page query arguments, clamped to sane bounds"""
+    page = max(1, request.args.get('page', 1, type=int))
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    return page, max(1, min(per_page, max_per_page))
+
+
+def get_event_counts():
+    """Participant count per event id, without copying the store"""
+    from app import event_store
+    return event_store.counts()
+
+
+def refresh_store():
+    """Pick up changes written by other workers"""
+    from app import event_store
+    event_store.refresh()
+
+
+def encode_cursor(position):
+    """Opaque ?cursor= token for a timeline position"""
+    raw = json.dumps(list(position), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Timeline position from a ?cursor= token, or None if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        position = tuple(json.loads(raw))
+    except (ValueError, TypeError):
+        return None
+    if len(position) != 3 or not all(isinstance(value, int) for value in position):
+        return None
+    return position
+
+
+def get_participant_timeline():
+    """Import participant_timeline from app module"""
+    from app import participant_timeline
+    return participant_timeline
+
+
+def get_participant_index():
+    """Import participant_index from app module"""
+    from app import participant_index
+    return participant_index
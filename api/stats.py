@@ -0,0 +1,61 @@
+from datetime import timedelta
+from flask import Blueprint, request, jsonify, current_app
+
+from api.events import auth_required, refresh_store
+from stats import GRANULARITIES, parse_timestamp
+
+stats_bp = Blueprint('stats', __name__)
+
+
+@stats_bp.route('/stats', methods=['GET'])
+@auth_required
+def get_stats():
+    """Registrations per event and per day or hour (admin only)"""
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': f'granularity must be one of: {", ".join(GRANULARITIES)}'}), 400
+
+    event_id = request.args.get('event_id', type=int)
+    if event_id is not None and (event_id < 1 or event_id > 4):
+        return jsonify({'error': 'Event ID must be between 1 and 4'}), 400
+
+    try:
+        start = parse_bound(request.args.get('from'))
+        end = parse_bound(request.args.get('to'), end_of_day=True)
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates or datetimes'}), 400
+
+    try:
+        refresh_store()
+        events = get_registration_stats().query(event_id, start, end, granularity)
+        return jsonify({
+            'success': True,
+            'granularity': granularity,
+            'from': request.args.get('from'),
+            'to': request.args.get('to'),
+            'total': sum(e['total'] for e in events),
+            'range_total': sum(e['range_total'] for e in events),
+            'events': events
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error computing stats: {str(e)}")
+        return jsonify({'error': 'Failed to compute stats'}), 500
+
+
+def parse_bound(value, end_of_day: bool = False):
+    """Epoch seconds for a query bound; a plain date as upper bound includes that day"""
+    if not value:
+        return None
+    epoch = parse_timestamp(value)
+    if epoch is None:
+        raise ValueError(value)
+    if end_of_day and len(value) == 10:
+        epoch += int(timedelta(days=1).total_seconds())
+    return epoch
+
+
+def get_registration_stats():
+    """Import registration_stats from app module"""
+    from app import registration_stats
+    return registration_stats
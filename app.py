@@ -2,39 +2,55 @@ import os
 import json
 import jwt
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Dict, List, Optional
 
 from flask import Flask, jsonify, request, send_from_directory, make_response
-from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 import bcrypt
+from bundles import ContentBundles
+from cms import ContentManager
+from columns import ParticipantColumns
 from config import Config
+from cors import init_cors
+from participants import migrate_legacy_participants
+from profiling import init_profiling, track_store_io
+from search import ParticipantIndex
+from stats import RegistrationStats
+from store import EventStore
+from stream import StreamBroker
+from timeline import ParticipantTimeline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class JSONProvider(DefaultJSONProvider):
+    """Serializes compact participant columns as plain lists of dicts"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, ParticipantColumns):
+            return o.to_list()
+        return DefaultJSONProvider.default(o)
+
+
 def create_app():
     """Application Factory Pattern"""
     app = Flask(__name__)
+    app.json = JSONProvider(app)
+    app.config.from_object(Config)
 
     # Validate critical environment variables
     if not Config.JWT_SECRET:
         raise RuntimeError('JWT_SECRET environment variable is required')
 
-    # Configure CORS
-    CORS(app, resources={
-        r"/api/*": {
-            "origins": Config.CORS_ORIGINS,
-            "methods": ["GET", "POST", "DELETE", "OPTIONS", "PUT"],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Type", "Authorization"],
-            "supports_credentials": True
-        }
-    })
+    # Configure CORS (preflights are answered before routing)
+    init_cors(app)
 
     # Ensure required directories exist
     os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
@@ -42,34 +58,62 @@ def create_app():
 
     # Initialize data files if they don't exist
     initialize_data_files()
+    # The legacy participants.json is folded into events.json once
+    migrate_legacy_participants(event_store, Config.PARTICIPANTS_FILE)
+
+    # Opt-in request profiling and slow-request log
+    init_profiling(app)
+
+    # Render content bundles now rather than on the first request, then
+    # index the search from the warm render cache. Content problems must not
+    # keep the events API from starting; /api/content retries per request.
+    try:
+        content_bundles.precompile()
+        content_manager.build_search_index()
+    except Exception as e:
+        logger.error(f"Content precompile failed, serving content on demand: {e}")
 
     # Register blueprints AFTER app is created
     from api.events import events_bp
     from api.auth import auth_bp
+    from api.diagnostics import diagnostics_bp
+    from api.stats import stats_bp
+    from api.content import content_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(diagnostics_bp, url_prefix='/api')
+    app.register_blueprint(stats_bp, url_prefix='/api')
+    app.register_blueprint(content_bp, url_prefix='/api')
+
+    # Background readiness checks
+    from health import checker, register_check
+    register_check('store_cache', lambda: dict(event_store.cache_info(), ok=True))
+    register_check('stream', lambda: {
+        'ok': True,
+        'clients': stream_broker.clients,
+        'queue_depth': stream_broker.queue_depth()
+    })
+    checker.ensure_started()
 
     # Register routes
     @app.route('/health')
+    @app.route('/health/live')
     def health_check():
-        """Health check endpoint for monitoring"""
+        """Liveness check: the process is up and serving requests"""
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
             'version': '2.0.0'
         })
 
-    @app.after_request
-    def after_request(response):
-        """Add CORS headers to all responses"""
-        origin = request.headers.get('Origin')
-        if origin in Config.CORS_ORIGINS:
-            response.headers['Access-Control-Allow-Origin'] = origin
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            response.headers['Access-Control-Allow-Credentials'] = 'true'
-        return response
+    @app.route('/health/ready')
+    def readiness_check():
+        """Readiness check served from cached background check results"""
+        checker.ensure_started()
+        ready, report = checker.snapshot()
+        report['version'] = '2.0.0'
+        return jsonify(report), 200 if ready else 503
 
     return app
 
@@ -125,13 +169,6 @@ def initialize_data_files():
             json.dump(default_events, f, indent=2, ensure_ascii=False)
         logger.info(f"Initialized events file: {Config.EVENTS_FILE}")
 
-    # Initialize participants file (legacy support)
-    if not os.path.exists(Config.PARTICIPANTS_FILE):
-        with open(Config.PARTICIPANTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump([], f)
-        logger.info(
-            f"Initialized participants file: {Config.PARTICIPANTS_FILE}")
-
 
 # JWT Helper Functions
 def generate_token(username: str) -> str:
@@ -178,25 +215,42 @@ def auth_required(f):
 
 
 # Data Helper Functions
+# One cache per worker process, shared by all requests and threads
+event_store = EventStore(Config.EVENTS_FILE, snapshot=Config.EVENTS_SNAPSHOT)
+stream_broker = StreamBroker(
+    event_store,
+    poll_interval=Config.SSE_POLL_SECONDS,
+    heartbeat=Config.SSE_HEARTBEAT_SECONDS,
+    max_clients=Config.SSE_MAX_CLIENTS,
+    max_seconds=Config.SSE_MAX_SECONDS
+)
+registration_stats = RegistrationStats()
+event_store.subscribe(registration_stats.on_store_change)
+participant_index = ParticipantIndex()
+event_store.subscribe(participant_index.on_store_change)
+participant_timeline = ParticipantTimeline()
+event_store.subscribe(participant_timeline.on_store_change)
+content_manager = ContentManager(Config.CONTENT_DIR)
+content_bundles = ContentBundles(content_manager)
+
+
 def load_events() -> List[Dict]:
-    """Load events from JSON file"""
-    try:
-        with open(Config.EVENTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        logger.error(f"Error loading events: {e}")
-        return []
+    """Load events from the event store"""
+    with track_store_io():
+        return event_store.load()
 
 
 def save_events(events: List[Dict]) -> bool:
-    """Save events to JSON file"""
-    try:
-        with open(Config.EVENTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        logger.error(f"Error saving events: {e}")
-        return False
+    """Save events to the event store"""
+    with track_store_io():
+        return event_store.save(events)
+
+
+@contextmanager
+def events_transaction():
+    """Read-modify-write the event store; nothing is saved if the block raises"""
+    with track_store_io(), event_store.transaction() as events:
+        yield events
 
 
 def get_event_image_url(event: Dict) -> str:
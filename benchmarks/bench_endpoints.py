@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Micro-benchmark every backend route through the Flask test client.
+
+Usage:
+    python -m benchmarks.bench_endpoints --sizes 0,1000,10000 --output bench_results.json
+
+Each route is timed against synthetic datasets of the given sizes
+(participants per event). Latencies are measured without tracing; peak memory
+comes from a separate, shorter pass under tracemalloc. Results are written as
+JSON so runs from different commits can be compared.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.datasets import generate_events, write_events_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_USERNAME = 'admin'
+BENCH_PASSWORD = 'benchmark-password'
+
+# Smallest valid PNG (1x1 transparent pixel)
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6300010000000500010d0a2db40000'
+    '000049454e44ae426082'
+)
+
+
+def import_csv(i: int, rows: int = 1000) -> bytes:
+    """A CSV upload with addresses that are unique per iteration"""
+    lines = ['name,email,message']
+    lines += [f'Import {i}-{n},import.{i}.{n}@example.org,Benchmark' for n in range(rows)]
+    return '\n'.join(lines).encode('utf-8')
+
+
+def deep_cursor(skip: int) -> Dict:
+    """?cursor= past the newest skip participants, for a deep page"""
+    from api.events import encode_cursor
+    from app import event_store, participant_timeline
+
+    event_store.refresh()
+    _, position = participant_timeline.page(None, skip)
+    return {'cursor': encode_cursor(position)} if position else {}
+
+
+class Case(NamedTuple):
+    name: str
+    method: str
+    path: str
+    auth: bool = False
+    # Builds keyword arguments for client.open() for iteration i
+    request: Optional[Callable[[int], Dict]] = None
+    # Restore the dataset before every iteration (for destructive routes)
+    restore: bool = False
+
+
+CASES = [
+    Case('auth.login', 'POST', '/api/login',
+         request=lambda i: {'json': {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}}),
+    Case('auth.verify', 'GET', '/api/verify', auth=True),
+    Case('events.get_events', 'GET', '/api/events'),
+    Case('events.get_events[fields]', 'GET', '/api/events?fields=id,title,display_image_url'),
+    Case('events.get_event', 'GET', '/api/events/1'),
+    Case('events.update_event', 'PUT', '/api/events/1', auth=True,
+         request=lambda i: {'json': {'title': f'Event 1 ({i})', 'description': 'Benchmark'}}),
+    Case('events.reset_event', 'POST', '/api/events/1/reset', auth=True, restore=True),
+    Case('events.get_participants', 'GET', '/api/events/1/participants', auth=True),
+    Case('events.get_participants[fields]', 'GET',
+         '/api/events/1/participants?fields=name,timestamp', auth=True),
+    Case('events.get_participants[q]', 'GET', '/api/events/1/participants?q=anna', auth=True),
+    Case('events.list_all_participants', 'GET', '/api/participants?limit=100', auth=True),
+    Case('events.list_all_participants[cursor]', 'GET', '/api/participants', auth=True,
+         request=lambda i: {'query_string': dict(deep_cursor(1000), limit=100)}),
+    Case('events.list_all_participants[fields]', 'GET',
+         '/api/participants?limit=100&fields=name,email,event_id', auth=True),
+    Case('events.search_participants', 'GET', '/api/participants/search?q=anna', auth=True),
+    Case('events.search_participants[prefix]', 'GET',
+         '/api/participants/search?q=m%C3%BC+ich&per_page=50', auth=True),
+    Case('events.add_participant', 'POST', '/api/events/1/participants',
+         request=lambda i: {'json': {'name': f'Bench {i}', 'email': f'bench.{i}@example.org',
+                                     'message': 'Benchmark'}}),
+    Case('events.import_participants', 'POST', '/api/events/1/participants/import', auth=True,
+         request=lambda i: {'data': {'file': (io.BytesIO(import_csv(i)), 'import.csv')},
+                            'content_type': 'multipart/form-data'}),
+    Case('events.export_participants', 'GET', '/api/events/1/export', auth=True),
+    Case('events.upload_event_image', 'POST', '/api/events/1/upload', auth=True,
+         request=lambda i: {'data': {'file': (io.BytesIO(PNG_BYTES), 'banner.png')},
+                            'content_type': 'multipart/form-data'}),
+    Case('events.uploaded_file', 'GET', '/api/uploads/bench.png'),
+    Case('events.remove_event_image', 'POST', '/api/events/1/remove-image', auth=True),
+    Case('events.batch_operations', 'POST', '/api/batch', auth=True,
+         request=lambda i: {'json': {'operations': [
+             {'op': 'update', 'event_id': e, 'data': {'title': f'Event {e} ({i})'}}
+             for e in range(1, 5)
+         ] + [{'op': 'remove-image', 'event_id': 1}]}}),
+    Case('stats.get_stats', 'GET', '/api/stats?granularity=hour&from=2024-05-15', auth=True),
+    Case('stats.get_stats[day]', 'GET', '/api/stats', auth=True),
+    Case('content.get_negotiated_bundle', 'GET', '/api/content',
+         request=lambda i: {'environ_base': {'HTTP_ACCEPT_LANGUAGE': 'tr-TR,tr;q=0.9,en;q=0.5'}}),
+    Case('content.get_bundle', 'GET', '/api/content/de'),
+    Case('content.get_section', 'GET', '/api/content/en/vision'),
+    Case('content.search_content', 'GET', '/api/content/search?q=vision&lang=de'),
+]
+
+
+def configure_environment(workdir: str) -> None:
+    """Point the app at a scratch data directory before it is imported"""
+    import bcrypt
+
+    os.environ['EVENTS_FILE'] = os.path.join(workdir, 'data', 'events.json')
+    os.environ['PARTICIPANTS_FILE'] = os.path.join(workdir, 'data', 'participants.json')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['PROFILE_DIR'] = os.path.join(workdir, 'profiles')
+    os.environ['CONTENT_DIR'] = os.path.join(workdir, 'content')
+    shutil.copytree(os.path.join(ROOT, 'content'), os.environ['CONTENT_DIR'])
+    os.environ['SLOW_REQUEST_MS'] = '1e12'
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+    os.environ['ADMIN_USERNAME'] = BENCH_USERNAME
+    # Low cost factor keeps the login benchmark about the route, not bcrypt
+    os.environ['ADMIN_PASSWORD_HASH'] = bcrypt.hashpw(
+        BENCH_PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_case(client, case: Case, headers: Dict, restore: Callable[[], None],
+             iterations: int, max_seconds: float) -> Dict:
+    """Time one route; returns latencies in seconds and status codes"""
+    latencies = []
+    statuses: Dict[str, int] = {}
+    budget_end = time.perf_counter() + max_seconds
+
+    for i in range(iterations):
+        if case.restore:
+            restore()
+        kwargs = case.request(i) if case.request else {}
+        started = time.perf_counter()
+        response = client.open(case.path, method=case.method,
+                               headers=headers if case.auth else None, **kwargs)
+        response.get_data()
+        latencies.append(time.perf_counter() - started)
+        response.close()
+
+        status = str(response.status_code)
+        statuses[status] = statuses.get(status, 0) + 1
+        if i >= 2 and time.perf_counter() > budget_end:
+            break
+
+    return {'latencies': latencies, 'statuses': statuses}
+
+
+def measure_peak_memory(client, case: Case, headers: Dict,
+                        restore: Callable[[], None], iterations: int) -> int:
+    """Peak traced allocation over a few iterations of a route"""
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            if case.restore:
+                restore()
+            tracemalloc.reset_peak()
+            kwargs = case.request(i) if case.request else {}
+            client.open(case.path, method=case.method,
+                        headers=headers if case.auth else None, **kwargs).close()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(case: Case, size: int, run: Dict, peak_memory: int,
+              dataset_bytes: int) -> Dict:
+    latencies = sorted(run['latencies'])
+    total = sum(latencies)
+    return {
+        'endpoint': case.name,
+        'method': case.method,
+        'path': case.path,
+        'participants_per_event': size,
+        'dataset_bytes': dataset_bytes,
+        'iterations': len(latencies),
+        'ops_per_sec': round(len(latencies) / total, 2) if total else None,
+        'latency_ms': {
+            'mean': round(total / len(latencies) * 1000, 3),
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p95': round(percentile(latencies, 95) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3),
+        },
+        'peak_memory_bytes': peak_memory,
+        'status_codes': run['statuses']
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='0,100,1000,10000',
+                        help='comma-separated participants per event (max 100000)')
+    parser.add_argument('--iterations', type=int, default=50,
+                        help='timed iterations per route and size')
+    parser.add_argument('--memory-iterations', type=int, default=3,
+                        help='iterations under tracemalloc for peak memory')
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help='time budget per route and size')
+    parser.add_argument('--only', default='',
+                        help='comma-separated endpoint names to run')
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    if any(not 0 <= s <= 100000 for s in sizes):
+        parser.error('--sizes must be between 0 and 100000')
+    only = {name.strip() for name in args.only.split(',') if name.strip()}
+    cases = [case for case in CASES if not only or case.name in only]
+
+    workdir = tempfile.mkdtemp(prefix='kosge-bench-')
+    configure_environment(workdir)
+
+    from app import app, generate_token
+    from config import Config
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {generate_token(BENCH_USERNAME)}'}
+    with open(os.path.join(Config.UPLOAD_FOLDER, 'bench.png'), 'wb') as f:
+        f.write(PNG_BYTES)
+
+    results = []
+    for size in sizes:
+        events = generate_events(size)
+        dataset_bytes = write_events_file(Config.EVENTS_FILE, events)
+
+        def restore():
+            write_events_file(Config.EVENTS_FILE, events)
+
+        for case in cases:
+            restore()
+            run = run_case(client, case, headers, restore,
+                           args.iterations, args.max_seconds)
+            restore()
+            peak = measure_peak_memory(client, case, headers, restore,
+                                       args.memory_iterations)
+            result = summarize(case, size, run, peak, dataset_bytes)
+            results.append(result)
+            print(f"[bench] {case.name:<32} n={size:<6} "
+                  f"{result['ops_per_sec']:>9} ops/s  "
+                  f"p95={result['latency_ms']['p95']:>9} ms  "
+                  f"peak={peak / 1024:.0f} KiB", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': args.iterations,
+            'sizes': sizes
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench] Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
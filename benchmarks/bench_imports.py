@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Measure the import cost of cms.py for read-only content consumers.
+
+Usage:
+    python -m benchmarks.bench_imports --repeat 7 --output bench_imports.json
+
+Each scenario runs in a fresh interpreter under `python -X importtime`. The
+script reports the median of the cumulative import times of everything
+imported after interpreter startup (after `site`), and which heavy modules
+ended up loaded. "eager" imports the dependencies cms.py used to load at
+import time, as a baseline.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('deep_translator', 'frontmatter', 'markdown', 'yaml', 'i18n', 'sqlite3')
+
+SCENARIOS = {
+    'eager': 'import deep_translator, frontmatter, markdown, yaml, i18n, sqlite3, '
+             'concurrent.futures, cms',
+    'import': 'import cms',
+    'list_sections': 'import cms; cms.ContentManager({content!r}).list_sections("en")',
+    'get_content': 'import cms; cms.ContentManager({content!r}).get_content("vision", "en")',
+}
+
+
+def import_ms(stderr: str) -> float:
+    """Sum of top-level cumulative import times after interpreter startup"""
+    total = 0
+    started = False
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('| cumulative | imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        if started:
+            total += int(cumulative)
+        elif name.strip() == 'site':
+            started = True
+    return total / 1000
+
+
+def run(code: str) -> Dict:
+    probe = f'; import sys; print(",".join(m for m in {HEAVY!r} if m in sys.modules))'
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code + probe],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = completed.stdout.strip()
+    return {'ms': import_ms(completed.stderr), 'loaded': loaded.split(',') if loaded else []}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--output', default='bench_imports.json')
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        content = os.path.join(directory, 'content')
+        shutil.copytree(os.path.join(ROOT, 'content'), content)
+        # Warm the section index, as a long-running deployment would have it
+        run(SCENARIOS['list_sections'].format(content=content))
+
+        for name, code in SCENARIOS.items():
+            code = code.format(content=content)
+            runs = [run(code) for _ in range(args.repeat)]
+            result = {
+                'scenario': name,
+                'import_ms': round(statistics.median(r['ms'] for r in runs), 1),
+                'loaded': runs[-1]['loaded']
+            }
+            results.append(result)
+            print(f"[imports] {name:<14} {result['import_ms']:7.1f} ms  "
+                  f"loaded: {', '.join(result['loaded']) or '-'}", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    print(f'[imports] Wrote {len(results)} results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
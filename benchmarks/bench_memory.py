@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare the memory of participant dicts with ParticipantColumns.
+
+Usage:
+    python -m benchmarks.bench_memory --sizes 10000,100000,1000000 --output bench_memory.json
+
+For each size, one event's participants are parsed from JSON the way the
+event store reads events.json. Retained memory (tracemalloc) is measured for
+the list of dicts and for the same data compacted into ParticipantColumns,
+together with the time to compact and to materialise everything again.
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.datasets import generate_participants
+from columns import ParticipantColumns
+
+
+def retained(build) -> tuple:
+    """(bytes still allocated after build() returns, result, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = build()
+        seconds = time.perf_counter() - started
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, result, seconds
+    finally:
+        tracemalloc.stop()
+
+
+def measure(size: int, seed: int = 42) -> Dict:
+    raw = json.dumps(generate_participants(
+        1, size, random.Random(seed), datetime(2024, 6, 1)), ensure_ascii=False)
+
+    dict_bytes, participants, parse_seconds = retained(lambda: json.loads(raw))
+    del participants
+
+    def build_columns():
+        # Parse and compact, dropping the dicts as the store does
+        return ParticipantColumns(1, json.loads(raw))
+
+    column_bytes, columns, compact_seconds = retained(build_columns)
+
+    started = time.perf_counter()
+    restored = columns.to_list()
+    materialize_seconds = time.perf_counter() - started
+    if restored != json.loads(raw):
+        raise SystemExit(f'Round trip mismatch at {size} participants')
+
+    return {
+        'participants': size,
+        'json_bytes': len(raw.encode('utf-8')),
+        'dicts_bytes': dict_bytes,
+        'columns_bytes': column_bytes,
+        'bytes_per_participant': {
+            'dicts': round(dict_bytes / size, 1) if size else 0,
+            'columns': round(column_bytes / size, 1) if size else 0,
+        },
+        'reduction': round(1 - column_bytes / dict_bytes, 3) if dict_bytes else None,
+        'irregular': len(columns.irregular),
+        'seconds': {
+            'json_load': round(parse_seconds, 3),
+            'json_load_and_compact': round(compact_seconds, 3),
+            'materialize': round(materialize_seconds, 3),
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='comma-separated participant counts')
+    parser.add_argument('--output', default='bench_memory.json')
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+        result = measure(size)
+        results.append(result)
+        print(f"[memory] n={size:<8} dicts={result['dicts_bytes'] / 2**20:8.1f} MiB  "
+              f"columns={result['columns_bytes'] / 2**20:8.1f} MiB  "
+              f"(-{result['reduction'] * 100:.0f}%)  "
+              f"materialize={result['seconds']['materialize']:.2f}s", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    print(f'[memory] Wrote {len(results)} results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Compare cold loads of events.json with loads of its columnar snapshot.
+
+Usage:
+    python -m benchmarks.bench_snapshot --sizes 10000,100000 --output bench_snapshot.json
+
+For each size (participants per event, four events), events.json is written
+the way the store writes it. The script then times a cold EventStore load
+that parses JSON and compacts participants (writing the snapshot) against a
+cold load from the snapshot. File sizes and the time to write the snapshot
+are reported too.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.datasets import generate_events, write_events_file
+from snapshot import write_snapshot
+from store import EventStore
+
+
+def cold_load(path: str, snapshot: bool, repeat: int) -> float:
+    """Median seconds for a fresh store's first load()"""
+    times = []
+    for _ in range(repeat):
+        store = EventStore(path, snapshot=snapshot)
+        started = time.perf_counter()
+        store.load()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def measure(size: int, repeat: int) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'events.json')
+        json_bytes = write_events_file(path, generate_events(size))
+
+        # JSON parse and compaction only: no snapshot is read or written
+        json_seconds = cold_load(path, False, repeat)
+
+        store = EventStore(path, snapshot=True)
+        events = store.load()
+        if store.cache_info()['snapshot_loads']:
+            raise SystemExit('Expected a JSON load before the snapshot exists')
+        stat = os.stat(path)
+        started = time.perf_counter()
+        write_snapshot(store.snapshot_path, events, (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        write_seconds = time.perf_counter() - started
+
+        snapshot_seconds = cold_load(path, True, repeat)
+        restored = EventStore(path, snapshot=True)
+        if [e.get('participants') and e['participants'].to_list() for e in restored.load()] != \
+                [e.get('participants') and e['participants'].to_list() for e in events]:
+            raise SystemExit(f'Snapshot round trip mismatch at {size} participants')
+        if not restored.cache_info()['snapshot_loads']:
+            raise SystemExit('Snapshot was not used')
+
+        return {
+            'participants_per_event': size,
+            'json_bytes': json_bytes,
+            'snapshot_bytes': os.path.getsize(store.snapshot_path),
+            'seconds': {
+                'json_load': round(json_seconds, 4),
+                'snapshot_load': round(snapshot_seconds, 4),
+                'snapshot_write': round(write_seconds, 4),
+            },
+            'speedup': round(json_seconds / snapshot_seconds, 1) if snapshot_seconds else None
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help='comma-separated participants per event')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='bench_snapshot.json')
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+        result = measure(size, args.repeat)
+        results.append(result)
+        print(f"[snapshot] n={size:<7} json={result['json_bytes'] / 2**20:6.1f} MiB "
+              f"{result['seconds']['json_load']:.3f}s  "
+              f"snapshot={result['snapshot_bytes'] / 2**20:6.1f} MiB "
+              f"{result['seconds']['snapshot_load']:.3f}s  "
+              f"(x{result['speedup']})", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    print(f'[snapshot] Wrote {len(results)} results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Compare serial translate_content() calls with ContentManager.translate_all().
+
+Usage:
+    python -m benchmarks.bench_translate --sections 20 --latency 0.05 --workers 1,4,8
+
+Runs offline against FakeBackend, which sleeps --latency seconds per call in
+place of a network round trip. Each run uses a fresh content directory and
+an empty translation memory, so every (section, language) pair is one call.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from cms import ContentManager
+from translation import FakeBackend
+
+
+def make_content(directory: str, sections: int) -> ContentManager:
+    manager = ContentManager(directory, translator=FakeBackend())
+    for i in range(sections):
+        manager.create_content(f'section-{i}', f'Abschnitt {i}',
+                               f'# Abschnitt {i}\n\nErster Absatz {i}.\n\nZweiter Absatz {i}.')
+    return manager
+
+
+def run(sections: int, latency: float, workers: int) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        manager = make_content(directory, sections)
+        backend = manager.translator = FakeBackend(max_concurrency=workers or 1, delay=latency)
+        started = time.perf_counter()
+        if workers:
+            report = manager.translate_all(max_workers=workers)
+            translated = report['translated']
+        else:
+            translated = sum(
+                manager.translate_content(s['section'], language)
+                for s in manager.list_sections()
+                for language in manager.supported_languages[1:])
+        seconds = time.perf_counter() - started
+        return {
+            'mode': f'translate_all[{workers}]' if workers else 'serial',
+            'tasks': translated,
+            'backend_calls': backend.calls,
+            'seconds': round(seconds, 3)
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='simulated seconds per backend call')
+    parser.add_argument('--workers', default='1,4,8',
+                        help='comma-separated translate_all pool sizes')
+    parser.add_argument('--output', default='bench_translate.json')
+    args = parser.parse_args()
+
+    results: List[Dict] = [run(args.sections, args.latency, 0)]
+    for workers in [int(w) for w in args.workers.split(',') if w.strip()]:
+        results.append(run(args.sections, args.latency, workers))
+    for result in results:
+        print(f"[translate] {result['mode']:<18} tasks={result['tasks']:<5} "
+              f"calls={result['backend_calls']:<5} {result['seconds']:.2f}s", file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'python': sys.version.split()[0], 'latency': args.latency,
+                   'results': results}, f, indent=2)
+    print(f'[translate] Wrote {len(results)} results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
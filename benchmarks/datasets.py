@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Generate synthetic events.json files for benchmarks.
+
+Usage:
+    python -m benchmarks.datasets --participants 100000 --output data/events.json
+
+Every event gets the same number of participants, with registrations spread
+over the 30 days before ``--start``. Output is deterministic for a given seed.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+FIRST_NAMES = [
+    'Anna', 'Ben', 'Clara', 'Deniz', 'Elif', 'Felix', 'Greta', 'Hasan',
+    'Irina', 'Jonas', 'Katja', 'Leon', 'Mila', 'Noah', 'Olga', 'Paul',
+    'Rania', 'Sami', 'Tanja', 'Yusuf'
+]
+LAST_NAMES = [
+    'Müller', 'Schmidt', 'Yilmaz', 'Kaya', 'Ivanova', 'Petrov', 'Haddad',
+    'Weber', 'Fischer', 'Demir', 'Schulz', 'Becker', 'Nasser', 'Wagner'
+]
+MESSAGES = [
+    '',
+    '',
+    'Ich komme mit einer Freundin.',
+    'Gibt es vor Ort Kinderbetreuung?',
+    'Looking forward to it!',
+    'Bitte auf die Warteliste setzen, falls voll.',
+    'Kann ich beim Aufbau helfen?',
+]
+DEFAULT_IMAGES = [
+    'https://link.storjshare.io/raw/julpadc66a57pal46igjl4azssja/geko/event0.png',
+    'https://link.storjshare.io/raw/jvknoz7bbo5l45f5kp4d62fhwt4a/geko/Event1.png',
+    'https://link.storjshare.io/raw/jwtanqrv3dqklcksophmccbgrora/geko/event2.jpg',
+    'https://link.storjshare.io/raw/juj6yfbpheluxs5uzwkfholsamrq/geko/Logo.png',
+]
+
+
+def generate_participants(event_id: int, count: int, rng: random.Random,
+                          start: datetime) -> List[Dict]:
+    """Participants in registration order with increasing timestamps"""
+    participants = []
+    window = timedelta(days=30).total_seconds()
+    offsets = sorted(rng.random() * window for _ in range(count))
+    for i, offset in enumerate(offsets):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        timestamp = start - timedelta(days=30) + timedelta(seconds=offset)
+        participants.append({
+            'name': f'{first} {last}',
+            'email': f'{first.lower()}.{i}.e{event_id}@example.org',
+            'message': rng.choice(MESSAGES),
+            'timestamp': timestamp.isoformat(),
+            'event_id': event_id
+        })
+    return participants
+
+
+def generate_events(participants_per_event: int, num_events: int = 4,
+                    seed: int = 42, start: datetime = None) -> List[Dict]:
+    """Events in the same shape as initialize_data_files() produces"""
+    rng = random.Random(seed)
+    start = start or datetime(2024, 6, 1)
+    events = []
+    for event_id in range(1, num_events + 1):
+        image = DEFAULT_IMAGES[(event_id - 1) % len(DEFAULT_IMAGES)]
+        events.append({
+            'id': event_id,
+            'title': f'Event {event_id}',
+            'description': f'Beschreibung für Event {event_id}',
+            'banner_url': image,
+            'default_image_url': image,
+            'uploaded_image': '',
+            'participants': generate_participants(
+                event_id, participants_per_event, rng, start),
+            'created_at': (start - timedelta(days=31)).isoformat()
+        })
+    return events
+
+
+def write_events_file(path: str, events: List[Dict]) -> int:
+    """Atomically write events the same way save_events() does; returns size"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(events, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--participants', type=int, default=1000,
+                        help='participants per event (0 to 100000)')
+    parser.add_argument('--events', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='data/events.json')
+    args = parser.parse_args()
+
+    if not 0 <= args.participants <= 100000:
+        parser.error('--participants must be between 0 and 100000')
+
+    events = generate_events(args.participants, args.events, args.seed)
+    size = write_events_file(args.output, events)
+    print(f"[datasets] Wrote {args.events} events x {args.participants} "
+          f"participants to {args.output} ({size} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Concurrent load test against the app running under gunicorn.
+
+Usage:
+    python -m benchmarks.loadtest --workers 2 --threads 4 --clients 16 --duration 30
+
+Starts ``gunicorn app:app`` on a scratch data directory, replays a mixed
+workload (public event listing, bursts of registrations, admin exports and
+image uploads) from client threads using http.client, and reports throughput
+and tail latency per operation. Once the server has stopped, every
+registration that was acknowledged with 201 is looked up in the events file;
+missing ones are reported as lost writes.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import bcrypt
+
+from benchmarks.bench_endpoints import (
+    BENCH_PASSWORD, BENCH_USERNAME, PNG_BYTES, git_revision, percentile
+)
+from benchmarks.datasets import generate_events, write_events_file
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVENT_IDS = (1, 2, 3, 4)
+DEFAULT_MIX = 'events=60,register=30,export=5,upload=5'
+
+
+class Recorder:
+    """Thread-safe collection of latencies, errors and acknowledged writes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.acknowledged: Dict[int, List[str]] = defaultdict(list)
+
+    def record(self, op: str, status: str, latency: float):
+        with self._lock:
+            self.latencies[op].append(latency)
+            self.statuses[op][status] += 1
+
+    def acknowledge(self, event_id: int, email: str):
+        with self._lock:
+            self.acknowledged[event_id].append(email)
+
+
+class Client:
+    """One keep-alive connection issuing the workload mix"""
+
+    def __init__(self, index: int, host: str, port: int, token: str,
+                 recorder: Recorder, mix: List[Tuple[str, int]], burst: int,
+                 seed: int):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.token = token
+        self.recorder = recorder
+        self.burst = burst
+        self.rng = random.Random(seed + index)
+        self.ops = [op for op, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.sequence = 0
+        self.conn = None
+
+    def request(self, op: str, method: str, path: str, body: bytes = None,
+                headers: Dict = None) -> Tuple[Optional[int], bytes]:
+        headers = dict(headers or {})
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            if response.will_close:
+                self.conn.close()
+                self.conn = None
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            self.recorder.record(op, type(e).__name__, time.perf_counter() - started)
+            return None, b''
+
+        self.recorder.record(op, str(status), time.perf_counter() - started)
+        return status, data
+
+    def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            op = self.rng.choices(self.ops, self.weights)[0]
+            getattr(self, f'do_{op}')()
+        if self.conn is not None:
+            self.conn.close()
+
+    def do_events(self):
+        self.request('events', 'GET', '/api/events')
+
+    def do_register(self):
+        event_id = self.rng.choice(EVENT_IDS)
+        for _ in range(self.rng.randint(1, self.burst)):
+            self.sequence += 1
+            email = f'load.{self.index}.{self.sequence}@example.org'
+            body = json.dumps({
+                'name': f'Load Client {self.index}',
+                'email': email,
+                'message': f'request {self.sequence}'
+            }).encode('utf-8')
+            status, _ = self.request(
+                'register', 'POST', f'/api/events/{event_id}/participants',
+                body, {'Content-Type': 'application/json'})
+            if status == 201:
+                self.recorder.acknowledge(event_id, email)
+
+    def do_export(self):
+        event_id = self.rng.choice(EVENT_IDS)
+        self.request('export', 'GET', f'/api/events/{event_id}/export',
+                     headers={'Authorization': f'Bearer {self.token}'})
+
+    def do_upload(self):
+        event_id = self.rng.choice(EVENT_IDS)
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\n'
+            'Content-Disposition: form-data; name="file"; filename="banner.png"\r\n'
+            'Content-Type: image/png\r\n\r\n'
+        ).encode('utf-8') + PNG_BYTES + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        self.request('upload', 'POST', f'/api/events/{event_id}/upload', body, {
+            'Authorization': f'Bearer {self.token}',
+            'Content-Type': f'multipart/form-data; boundary={boundary}'
+        })
+
+
+def parse_mix(value: str) -> List[Tuple[str, int]]:
+    mix = []
+    for part in value.split(','):
+        op, _, weight = part.partition('=')
+        op = op.strip()
+        if not hasattr(Client, f'do_{op}'):
+            raise ValueError(f'Unknown operation in mix: {op}')
+        mix.append((op, int(weight or 1)))
+    return mix
+
+
+def free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, workdir: str, port: int) -> subprocess.Popen:
+    """Launch gunicorn with a scratch data directory"""
+    env = dict(os.environ)
+    env.update({
+        'EVENTS_FILE': os.path.join(workdir, 'data', 'events.json'),
+        'PARTICIPANTS_FILE': os.path.join(workdir, 'data', 'participants.json'),
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'PROFILE_DIR': os.path.join(workdir, 'profiles'),
+        'JWT_SECRET': env.get('JWT_SECRET', 'loadtest-secret'),
+        'ADMIN_USERNAME': BENCH_USERNAME,
+        'ADMIN_PASSWORD_HASH': bcrypt.hashpw(
+            BENCH_PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8'),
+    })
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', f'{args.host}:{port}',
+        '--workers', str(args.workers),
+        '--threads', str(args.threads),
+        '--log-level', 'warning',
+    ] + args.gunicorn_arg
+    log = open(os.path.join(workdir, 'gunicorn.log'), 'wb')
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                            stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_until_ready(host: str, port: int, server: subprocess.Popen,
+                     timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError('gunicorn did not become ready in time')
+
+
+def login(host: str, port: int) -> str:
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    body = json.dumps({'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+    conn.request('POST', '/api/login', body=body,
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    data = json.loads(response.read() or b'{}')
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(f"Login failed: {response.status} {data}")
+    return data['token']
+
+
+def verify_writes(events_file: str, acknowledged: Dict[int, List[str]]) -> Dict:
+    """Check every acknowledged registration against the persisted store"""
+    try:
+        with open(events_file, 'r', encoding='utf-8') as f:
+            events = json.load(f)
+        readable = True
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[loadtest] Store is unreadable: {e}", file=sys.stderr)
+        events = []
+        readable = False
+
+    stored = {
+        event.get('id'): [p.get('email') for p in event.get('participants', [])]
+        for event in events
+    }
+    lost: List[Dict] = []
+    duplicated = 0
+    total = 0
+    for event_id, emails in acknowledged.items():
+        present = defaultdict(int)
+        for email in stored.get(event_id, []):
+            present[email] += 1
+        for email in emails:
+            total += 1
+            if not present.get(email):
+                lost.append({'event_id': event_id, 'email': email})
+            elif present[email] > 1:
+                duplicated += 1
+
+    return {
+        'store_readable': readable,
+        'acknowledged': total,
+        'lost': len(lost),
+        'duplicated': duplicated,
+        'lost_sample': lost[:20]
+    }
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict:
+    operations = {}
+    total = 0
+    for op, latencies in recorder.latencies.items():
+        latencies = sorted(latencies)
+        total += len(latencies)
+        operations[op] = {
+            'requests': len(latencies),
+            'throughput_per_sec': round(len(latencies) / elapsed, 2),
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50) * 1000, 2),
+                'p95': round(percentile(latencies, 95) * 1000, 2),
+                'p99': round(percentile(latencies, 99) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            },
+            'status_codes': dict(recorder.statuses[op])
+        }
+    acknowledged = sum(len(v) for v in recorder.acknowledged.values())
+    return {
+        'elapsed_sec': round(elapsed, 2),
+        'requests': total,
+        'throughput_per_sec': round(total / elapsed, 2),
+        'registrations_per_sec': round(acknowledged / elapsed, 2),
+        'operations': operations
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--clients', type=int, default=16,
+                        help='concurrent client threads')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'operation weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--burst', type=int, default=5,
+                        help='maximum registrations per register operation')
+    parser.add_argument('--participants', type=int, default=0,
+                        help='initial participants per event')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--gunicorn-arg', action='append', default=[],
+                        help='extra argument passed to gunicorn (repeatable)')
+    parser.add_argument('--output', default='',
+                        help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    workdir = tempfile.mkdtemp(prefix='kosge-load-')
+    events_file = os.path.join(workdir, 'data', 'events.json')
+    write_events_file(events_file, generate_events(args.participants, seed=args.seed))
+
+    port = free_port(args.host)
+    server = start_server(args, workdir, port)
+    recorder = Recorder()
+    try:
+        wait_until_ready(args.host, port, server)
+        token = login(args.host, port)
+
+        clients = [
+            Client(i, args.host, port, token, recorder, mix, args.burst, args.seed)
+            for i in range(args.clients)
+        ]
+        started = time.perf_counter()
+        deadline = started + args.duration
+        threads = [threading.Thread(target=c.run, args=(deadline,)) for c in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'workers': args.workers,
+            'threads': args.threads,
+            'clients': args.clients,
+            'duration_sec': args.duration,
+            'mix': dict(mix),
+            'initial_participants_per_event': args.participants,
+            'workdir': workdir
+        },
+        'load': summarize(recorder, elapsed),
+        'integrity': verify_writes(events_file, recorder.acknowledged)
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if report['integrity']['lost']:
+        print(f"[loadtest] {report['integrity']['lost']} acknowledged "
+              f"registrations missing from the store", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import json
+import hashlib
+import logging
+import threading
+from datetime import date
+from typing import Dict, Tuple
+
+from cms import ContentManager
+
+logger = logging.getLogger(__name__)
+
+
+class ContentBundles:
+    """Per-language bundles of every section's metadata and rendered HTML
+
+    A bundle is encoded once into JSON bytes with its ETag and reused until
+    a section file of that language is added, removed or changed. Checking
+    for changes costs one directory scan (mtime and size per file), so a
+    request for an unchanged bundle never renders or encodes anything.
+    Sections that fail to load are logged and left out.
+    """
+
+    def __init__(self, manager: ContentManager):
+        self.manager = manager
+        self._lock = threading.Lock()
+        # language -> (signature, body, etag)
+        self._bundles: Dict[str, Tuple[Tuple, bytes, str]] = {}
+        self.builds = 0
+
+    def precompile(self):
+        for language in self.manager.supported_languages:
+            self.get(language)
+
+    def get(self, language: str) -> Tuple[bytes, str]:
+        """JSON body and ETag of a language's bundle"""
+        signature = self._signature(language)
+        cached = self._bundles.get(language)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        with self._lock:
+            cached = self._bundles.get(language)
+            if cached is None or cached[0] != signature:
+                body = self._build(language)
+                cached = (signature, body, body_etag(body))
+                self._bundles[language] = cached
+                self.builds += 1
+            return cached[1], cached[2]
+
+    def _signature(self, language: str) -> Tuple:
+        return tuple(sorted(self.manager.section_stamps(language).items()))
+
+    def _build(self, language: str) -> bytes:
+        sections = {}
+        for listed in sorted(self.manager.list_sections(language), key=lambda s: s['section']):
+            try:
+                content = self.manager.get_content(listed['section'], language)
+            except Exception as e:
+                logger.error(f"Leaving {listed['section']} ({language}) out of its bundle: {e}")
+                continue
+            if content:
+                sections[listed['section']] = {
+                    'metadata': content['metadata'],
+                    'html': content['html']
+                }
+        return encode_json({'language': language, 'sections': sections})
+
+
+def encode_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_value).encode('utf-8')
+
+
+def body_etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def negotiate_language(accept_languages, supported, default: str) -> str:
+    """Best supported language for an Accept-Language header
+
+    Regional variants fall back to their primary language (de-AT -> de).
+    """
+    for value, quality in accept_languages:
+        if quality <= 0:
+            continue
+        if value == '*':
+            return default
+        primary = value.replace('_', '-').split('-')[0].lower()
+        if primary in supported:
+            return primary
+    return default
+
+
+def _json_value(value):
+    # YAML front matter parses unquoted dates into date/datetime objects
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
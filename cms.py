@@ -1,49 +1,71 @@
 import os
+import re
 import json
-import frontmatter
-import markdown
-from deep_translator import GoogleTranslator
-import yaml
-from datetime import datetime
-from typing import Dict, List, Optional
-import i18n
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+from content_search import ContentIndex
+from translation import GoogleBackend, TranslationBackend, translate_with_retry
+
+# frontmatter, markdown, the translator backends and the translation memory
+# are imported where they are first needed: processes that only serve
+# prebuilt bundles or the section index never load them
+if TYPE_CHECKING:
+    from translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+# Per-language manifest of section metadata, read by list_sections()
+SECTION_INDEX_FILE = '.index.json'
+SECTION_INDEX_VERSION = 1
+
+# Blank lines between Markdown paragraphs, the unit of translation memory
+PARAGRAPH_BREAK = re.compile(r'(\n[ \t]*\n\s*)')
 
 
 class ContentManager:
-    def __init__(self, content_dir: str = "content"):
+    def __init__(self, content_dir: str = "content", cache_size: int = 256,
+                 translator: Optional[TranslationBackend] = None):
         self.content_dir = content_dir
+        self.translator = translator or GoogleBackend()
         self.supported_languages = ['de', 'en', 'tr', 'ru', 'ar']
         self.default_language = 'de'
-        self._ensure_content_directory()
-        self.translation_memory = self._load_translation_memory()
-
-    def _ensure_content_directory(self):
-        """Ensure content directory and structure exists"""
-        if not os.path.exists(self.content_dir):
-            os.makedirs(self.content_dir)
-
-        # Create language directories
-        for lang in self.supported_languages:
-            lang_dir = os.path.join(self.content_dir, lang)
-            if not os.path.exists(lang_dir):
-                os.makedirs(lang_dir)
-
-    def _load_translation_memory(self) -> Dict:
-        """Load translation memory from file"""
-        memory_file = os.path.join(self.content_dir, 'translation_memory.json')
-        if os.path.exists(memory_file):
-            with open(memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-
-    def _save_translation_memory(self):
-        """Save translation memory to file"""
-        memory_file = os.path.join(self.content_dir, 'translation_memory.json')
-        with open(memory_file, 'w', encoding='utf-8') as f:
-            json.dump(self.translation_memory, f, ensure_ascii=False, indent=2)
+        # Parsed and rendered content per (section, language), validated by
+        # the file's (mtime, size); least recently used entries go first
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], Dict]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._section_indexes: Dict[str, Dict[str, Dict]] = {}
+        self._index_lock = threading.Lock()
+        self._translation_memory: Optional['TranslationMemory'] = None
+        self._memory_lock = threading.Lock()
+        self._search_index = ContentIndex(self)
+
+    @property
+    def translation_memory(self) -> 'TranslationMemory':
+        """Opened on first translation, so serving content never touches it"""
+        from translation_memory import TranslationMemory
+        with self._memory_lock:
+            if self._translation_memory is None:
+                self._translation_memory = TranslationMemory(
+                    os.path.join(self.content_dir, 'translation_memory.sqlite3'),
+                    legacy_path=os.path.join(self.content_dir, 'translation_memory.json'))
+            return self._translation_memory
+
+    def _ensure_content_directory(self, language: str):
+        """Create a language directory before its first file is written"""
+        os.makedirs(os.path.join(self.content_dir, language), exist_ok=True)
 
     def create_content(self, section: str, title: str, content: str, metadata: Dict = None) -> bool:
         """Create new content in the default language"""
+        import frontmatter
+
         if metadata is None:
             metadata = {}
 
@@ -57,17 +79,21 @@ class ContentManager:
         content_with_meta = frontmatter.Post(content, **metadata)
 
         # Save in default language
+        self._ensure_content_directory(self.default_language)
         filename = f"{section}.md"
         file_path = os.path.join(
             self.content_dir, self.default_language, filename)
 
         with open(file_path, 'w', encoding='utf-8') as f:
             frontmatter.dump(content_with_meta, f)
+        self._invalidate(section, self.default_language)
 
         return True
 
     def update_content(self, section: str, content: str, metadata: Dict = None, language: str = None) -> bool:
         """Update existing content"""
+        import frontmatter
+
         if language is None:
             language = self.default_language
 
@@ -89,6 +115,7 @@ class ContentManager:
             content_with_meta = frontmatter.Post(content, **existing_metadata)
             with open(file_path, 'w', encoding='utf-8') as f:
                 frontmatter.dump(content_with_meta, f)
+            self._invalidate(section, language)
             return True
 
         return False
@@ -101,18 +128,91 @@ class ContentManager:
         filename = f"{section}.md"
         file_path = os.path.join(self.content_dir, language, filename)
 
-        if not os.path.exists(file_path):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            self._invalidate(section, language)
             return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        key = (section, language)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return self._copy_entry(cached[1])
+            self._cache_misses += 1
+
+        import frontmatter
+        import markdown
 
         with open(file_path, 'r', encoding='utf-8') as f:
             post = frontmatter.load(f)
 
-        return {
+        entry = {
             'content': post.content,
             'metadata': post.metadata,
             'html': markdown.markdown(post.content)
         }
 
+        with self._cache_lock:
+            self._cache[key] = (stamp, entry)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return self._copy_entry(entry)
+
+    @staticmethod
+    def _copy_entry(entry: Dict) -> Dict:
+        # Callers (update_content among them) modify the metadata they get
+        return dict(entry, metadata=dict(entry['metadata']))
+
+    def _invalidate(self, section: str, language: str):
+        with self._cache_lock:
+            self._cache.pop((section, language), None)
+        with self._index_lock:
+            self._section_indexes.get(language, {}).pop(section, None)
+        self._search_index.discard(section, language)
+
+    def section_stamps(self, language: str) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) of every section file of a language"""
+        stamps = {}
+        try:
+            entries = list(os.scandir(os.path.join(self.content_dir, language)))
+        except FileNotFoundError:
+            return stamps
+        for entry in entries:
+            if not entry.name.endswith('.md'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            stamps[entry.name[:-3]] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def build_search_index(self):
+        """Index every language now instead of on the first search"""
+        self._search_index.build()
+
+    def search(self, query: str, language: str = None, limit: int = 10) -> Tuple[int, List[Dict]]:
+        """Ranked sections of a language matching every word of query"""
+        if language is None:
+            language = self.default_language
+        return self._search_index.search(query, language, limit)
+
+    def cache_info(self) -> Dict:
+        """Render cache statistics"""
+        with self._cache_lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'size': len(self._cache),
+                'maxsize': self.cache_size
+            }
+
     def translate_content(self, section: str, target_language: str) -> bool:
         """Translate content to target language"""
         if target_language not in self.supported_languages:
@@ -122,30 +222,106 @@ class ContentManager:
         if not source_content:
             return False
 
-        # Check translation memory
-        content_hash = hash(source_content['content'])
-        if content_hash in self.translation_memory.get(target_language, {}):
-            translated_content = self.translation_memory[target_language][content_hash]
-        else:
-            # Translate using Google Translator
-            translator = GoogleTranslator(source='de', target=target_language)
-            translated_content = translator.translate(
-                source_content['content'])
-
-            # Save to translation memory
-            if target_language not in self.translation_memory:
-                self.translation_memory[target_language] = {}
-            self.translation_memory[target_language][content_hash] = translated_content
-            self._save_translation_memory()
+        translated_content = self._translate_segments(
+            source_content['content'], target_language)
 
         # Update metadata for translation
         metadata = source_content['metadata'].copy()
         metadata['translated_at'] = datetime.now().isoformat()
         metadata['translated_from'] = self.default_language
 
+        # First translation into this language: there is nothing to update
+        file_path = os.path.join(self.content_dir, target_language, f"{section}.md")
+        if not os.path.exists(file_path):
+            import frontmatter
+
+            self._ensure_content_directory(target_language)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                frontmatter.dump(frontmatter.Post(translated_content, **metadata), f)
+            self._invalidate(section, target_language)
+            return True
+
         # Save translated content
         return self.update_content(section, translated_content, metadata, target_language)
 
+    def translate_all(self, sections: Optional[Iterable[str]] = None,
+                      languages: Optional[Iterable[str]] = None, max_workers: int = 4,
+                      progress: Optional[Callable[[int, int, str, str, bool], None]] = None,
+                      tasks: Optional[Iterable[Tuple[str, str]]] = None) -> Dict:
+        """Translate sections into languages on a bounded thread pool
+
+        Defaults to every section of the default language and every other
+        supported language; tasks picks (section, language) pairs instead.
+        Each pair is one task.
+        Backend calls are throttled by the backend's concurrency limit and
+        retried with backoff, so max_workers above that limit only overlaps
+        file work. progress(done, total, section, language, ok) is called as
+        tasks finish.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        if tasks is not None:
+            tasks = list(tasks)
+        else:
+            if sections is None:
+                sections = [s['section'] for s in self.list_sections()]
+            if languages is None:
+                languages = [l for l in self.supported_languages if l != self.default_language]
+            tasks = [(section, language) for section in sections for language in languages]
+
+        report = {'total': len(tasks), 'translated': 0, 'failed': []}
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix='translate') as pool:
+            futures = {
+                pool.submit(self.translate_content, section, language): (section, language)
+                for section, language in tasks
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                section, language = futures[future]
+                try:
+                    ok = future.result()
+                    error = None if ok else 'Section or translation file not found'
+                except Exception as e:
+                    ok, error = False, str(e)
+                if ok:
+                    report['translated'] += 1
+                else:
+                    logger.warning(f"Translating {section} to {language} failed: {error}")
+                    report['failed'].append(
+                        {'section': section, 'language': language, 'error': error})
+                if progress:
+                    progress(done, len(tasks), section, language, ok)
+        return report
+
+    def _translate_segments(self, text: str, target_language: str) -> str:
+        """Translate paragraph by paragraph, sending only unknown ones out
+
+        Paragraphs are looked up in the translation memory by the SHA-256 of
+        their text, so an edit re-translates only the paragraphs it touched.
+        Blank lines and surrounding whitespace are kept as they were.
+        """
+        parts, segments = split_segments(text)
+        keys = {i: segment_key(segment) for i, segment in segments.items()}
+
+        memory = self.translation_memory.get_many(target_language, keys.values())
+        missing = {}
+        for i, key in keys.items():
+            if key not in memory:
+                missing.setdefault(key, segments[i])
+        if missing:
+            translations = translate_with_retry(
+                self.translator, list(missing.values()),
+                self.default_language, target_language)
+            self.translation_memory.put_many(target_language, zip(missing, translations))
+            memory.update(zip(missing, translations))
+
+        for i, key in keys.items():
+            part = parts[i]
+            leading = part[:len(part) - len(part.lstrip())]
+            trailing = part[len(part.rstrip()):]
+            parts[i] = f'{leading}{memory[key]}{trailing}'
+        return ''.join(parts)
+
     def list_sections(self, language: str = None) -> List[Dict]:
         """List all available content sections"""
         if language is None:
@@ -157,18 +333,107 @@ class ContentManager:
         if not os.path.exists(content_path):
             return sections
 
-        for filename in os.listdir(content_path):
-            if filename.endswith('.md'):
-                section = filename[:-3]
-                content = self.get_content(section, language)
-                if content:
-                    sections.append({
-                        'section': section,
-                        'metadata': content['metadata']
-                    })
+        with self._index_lock:
+            index = self._section_index(language)
+            changed = False
+            seen = set()
+            for entry in os.scandir(content_path):
+                if not entry.name.endswith('.md'):
+                    continue
+                section = entry.name[:-3]
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                seen.add(section)
+
+                indexed = index.get(section)
+                if indexed is None or (indexed['mtime_ns'], indexed['size']) != \
+                        (stat.st_mtime_ns, stat.st_size):
+                    indexed = self._index_section(entry.path, stat, indexed)
+                    if indexed is None:
+                        continue
+                    index[section] = indexed
+                    changed = True
+
+                sections.append({
+                    'section': section,
+                    'metadata': dict(indexed['metadata'])
+                })
+
+            for section in set(index) - seen:
+                del index[section]
+                changed = True
+            if changed:
+                self._save_section_index(language, index)
 
         return sections
 
+    def _section_index(self, language: str) -> Dict[str, Dict]:
+        """Section manifest for a language, read from disk on first use"""
+        index = self._section_indexes.get(language)
+        if index is not None:
+            return index
+
+        index = {}
+        index_file = os.path.join(self.content_dir, language, SECTION_INDEX_FILE)
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f, object_hook=_decode_metadata_value)
+            if stored.get('version') == SECTION_INDEX_VERSION:
+                index = stored['sections']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Rebuilding section index {index_file}: {e}")
+        self._section_indexes[language] = index
+        return index
+
+    def _index_section(self, file_path: str, stat: os.stat_result,
+                       previous: Optional[Dict]) -> Optional[Dict]:
+        """Manifest entry for a changed file, parsing only its YAML header"""
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        if previous is not None and previous['sha256'] == digest:
+            # Touched but not changed
+            metadata = previous['metadata']
+        else:
+            import frontmatter
+            try:
+                metadata, _ = frontmatter.parse(data.decode('utf-8'))
+            except Exception as e:
+                # Not listed until the file is fixed
+                logger.error(f"Skipping unreadable section {file_path}: {e}")
+                return None
+
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'metadata': metadata
+        }
+
+    def _save_section_index(self, language: str, index: Dict[str, Dict]):
+        index_file = os.path.join(self.content_dir, language, SECTION_INDEX_FILE)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_file), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'version': SECTION_INDEX_VERSION, 'sections': index}, f,
+                              ensure_ascii=False, default=_encode_metadata_value)
+                os.replace(tmp_path, index_file)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            # The in-memory index still serves this process
+            logger.warning(f"Could not write section index {index_file}: {e}")
+
     def delete_content(self, section: str, language: str = None) -> bool:
         """Delete content for a specific section"""
         if language is None:
@@ -179,6 +444,39 @@ class ContentManager:
 
         if os.path.exists(file_path):
             os.remove(file_path)
+            self._invalidate(section, language)
             return True
 
         return False
+
+
+def split_segments(text: str) -> Tuple[List[str], Dict[int, str]]:
+    """Text split at blank lines, and the stripped paragraphs by part index"""
+    parts = PARAGRAPH_BREAK.split(text)
+    # Odd positions are the separators captured by the split
+    segments = {i: part.strip() for i, part in enumerate(parts)
+                if i % 2 == 0 and part.strip()}
+    return parts, segments
+
+
+def segment_key(text: str) -> str:
+    """Translation memory key of a paragraph"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _encode_metadata_value(value):
+    """JSON form of the dates and datetimes YAML headers parse into"""
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _decode_metadata_value(value: Dict):
+    if len(value) == 1:
+        if '$datetime' in value:
+            return datetime.fromisoformat(value['$datetime'])
+        if '$date' in value:
+            return date.fromisoformat(value['$date'])
+    return value
@@ -0,0 +1,185 @@
+import re
+import sys
+from array import array
+from copy import deepcopy
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Key order of participants created by the API
+FIELDS = ('name', 'email', 'message', 'timestamp', 'event_id')
+
+# Timestamp column value for a missing or unparseable timestamp
+NO_TIMESTAMP = -(2 ** 63)
+
+EPOCH = datetime(1970, 1, 1)
+
+# Timestamps that micros_to_timestamp() reproduces exactly, as written by
+# datetime.utcnow().isoformat()
+CANONICAL_TIMESTAMP = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.(?!0{6})\d{6})?\Z')
+
+
+class ParticipantColumns(Sequence):
+    """One event's participants stored column by column
+
+    A participant dict with its own key strings, timestamp string and
+    event_id costs several hundred bytes. Here a participant costs three
+    list slots and an 8-byte integer timestamp (microseconds since the
+    epoch, UTC). Names and messages are interned, so repeated values are
+    stored once. Records that would not round-trip exactly (extra or
+    missing keys, another key order, a timestamp in a different format,
+    a foreign event_id) are kept as a private deep copy of the original
+    dict, copied again by copy(), so no two instances share one.
+
+    Items are materialised as fresh dicts on access. The JSON encoders
+    (store writes and API responses) therefore see plain lists of dicts.
+    """
+
+    __slots__ = ('event_id', 'names', 'emails', 'messages', 'timestamps', 'irregular')
+
+    def __init__(self, event_id: Optional[int] = None, participants: Iterable[Dict] = ()):
+        self.event_id = event_id
+        self.names: List[str] = []
+        self.emails: List[str] = []
+        self.messages: List[str] = []
+        self.timestamps = array('q')
+        self.irregular: Dict[int, Dict] = {}
+        self.extend(participants)
+
+    @classmethod
+    def from_columns(cls, event_id: Optional[int], names: List[str], emails: List[str],
+                     messages: List[str], timestamps: array,
+                     irregular: Dict[int, Dict]) -> 'ParticipantColumns':
+        """Wrap already decoded columns (see snapshot.py) without copying them"""
+        columns = cls.__new__(cls)
+        columns.event_id = event_id
+        columns.names = names
+        columns.emails = emails
+        columns.messages = messages
+        columns.timestamps = timestamps
+        columns.irregular = irregular
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('participant index out of range')
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        irregular = self.irregular
+        event_id = self.event_id
+        rows = zip(self.names, self.emails, self.messages, self.timestamps)
+        for i, (name, email, message, micros) in enumerate(rows):
+            if irregular and i in irregular:
+                yield irregular[i]
+            else:
+                yield {'name': name, 'email': email, 'message': message,
+                       'timestamp': micros_to_timestamp(micros), 'event_id': event_id}
+
+    def __repr__(self) -> str:
+        return f'<ParticipantColumns event_id={self.event_id!r} len={len(self)}>'
+
+    def append(self, participant: Dict):
+        self.extend((participant,))
+
+    def extend(self, participants: Iterable[Dict]):
+        # One loop with local lookups: this runs for every participant on
+        # every (re)load of events.json
+        names, emails, messages = self.names, self.emails, self.messages
+        timestamps, irregular, event_id = self.timestamps, self.irregular, self.event_id
+        intern, canonical, parse = sys.intern, CANONICAL_TIMESTAMP.match, datetime.fromisoformat
+
+        for participant in participants:
+            timestamp = participant.get('timestamp')
+            micros = None
+            if (tuple(participant) == FIELDS and type(timestamp) is str and canonical(timestamp)
+                    and type(participant['name']) is str
+                    and type(participant['email']) is str
+                    and type(participant['message']) is str
+                    and type(participant['event_id']) is int
+                    and participant['event_id'] == event_id):
+                try:
+                    delta = parse(timestamp) - EPOCH
+                    micros = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+                except ValueError:
+                    pass
+
+            if micros is None:
+                irregular[len(timestamps)] = deepcopy(participant)
+                names.append('')
+                emails.append('')
+                messages.append('')
+                timestamps.append(timestamp_to_micros(timestamp))
+            else:
+                names.append(intern(participant['name']))
+                emails.append(participant['email'])
+                messages.append(intern(participant['message']))
+                timestamps.append(micros)
+
+    def copy(self) -> 'ParticipantColumns':
+        clone = ParticipantColumns.__new__(ParticipantColumns)
+        clone.event_id = self.event_id
+        clone.names = self.names.copy()
+        clone.emails = self.emails.copy()
+        clone.messages = self.messages.copy()
+        clone.timestamps = array('q', self.timestamps)
+        clone.irregular = {i: deepcopy(p) for i, p in self.irregular.items()}
+        return clone
+
+    def to_list(self) -> List[Dict]:
+        return list(self)
+
+    def _record(self, i: int) -> Dict:
+        if self.irregular:
+            record = self.irregular.get(i)
+            if record is not None:
+                return record
+        return {
+            'name': self.names[i],
+            'email': self.emails[i],
+            'message': self.messages[i],
+            'timestamp': micros_to_timestamp(self.timestamps[i]),
+            'event_id': self.event_id
+        }
+
+
+def compact_participants(event: Dict):
+    """Participant list of an event as ParticipantColumns (copied if it already is one)"""
+    participants = event.get('participants', [])
+    if isinstance(participants, ParticipantColumns):
+        return participants.copy()
+    return ParticipantColumns(event.get('id'), participants)
+
+
+def json_default(value):
+    """json.dump(default=...) hook that writes ParticipantColumns as a list"""
+    if isinstance(value, ParticipantColumns):
+        return value.to_list()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def timestamp_to_micros(value) -> int:
+    """Microseconds since the epoch for an ISO timestamp (naive values are UTC)"""
+    if not value or not isinstance(value, str):
+        return NO_TIMESTAMP
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return NO_TIMESTAMP
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = parsed - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def micros_to_timestamp(micros: int) -> str:
+    """Naive UTC ISO timestamp, formatted like datetime.utcnow().isoformat()"""
+    return (EPOCH + timedelta(0, 0, micros)).isoformat()
+
@@ -27,3 +27,33 @@ class Config:
     EVENTS_FILE = os.environ.get('EVENTS_FILE', 'data/events.json')
     PARTICIPANTS_FILE = os.environ.get(
         'PARTICIPANTS_FILE', 'data/participants.json')
+    # Markdown sections per language, served under /api/content
+    CONTENT_DIR = os.environ.get('CONTENT_DIR', 'content')
+    # Columnar snapshot of events.json for fast reloads (events.json.snapshot)
+    EVENTS_SNAPSHOT = os.environ.get('EVENTS_SNAPSHOT', 'true').lower() in ('1', 'true', 'yes')
+
+    # Profiling and slow-request log
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'data/profiles')
+    SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '500'))
+    SLOW_REQUEST_LOG = os.environ.get('SLOW_REQUEST_LOG', '')
+
+    # Readiness checks (refreshed in the background, served from cache)
+    HEALTH_CHECK_INTERVAL = float(os.environ.get('HEALTH_CHECK_INTERVAL', '15'))
+    HEALTH_MAX_WRITE_MS = float(os.environ.get('HEALTH_MAX_WRITE_MS', '1000'))
+    HEALTH_MIN_FREE_DISK_MB = int(os.environ.get('HEALTH_MIN_FREE_DISK_MB', '100'))
+
+    # How long browsers may cache a CORS preflight (seconds)
+    CORS_MAX_AGE = int(os.environ.get('CORS_MAX_AGE', '7200'))
+
+    # Server-Sent Events stream (per worker)
+    SSE_MAX_CLIENTS = int(os.environ.get('SSE_MAX_CLIENTS', '16'))
+    SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+    SSE_POLL_SECONDS = float(os.environ.get('SSE_POLL_SECONDS', '1'))
+    SSE_MAX_SECONDS = float(os.environ.get('SSE_MAX_SECONDS', '300'))
+
+    # CSV participant import
+    IMPORT_MAX_ROWS = int(os.environ.get('IMPORT_MAX_ROWS', '100000'))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', '100'))
+
+    # Largest number of operations accepted by POST /api/batch
+    BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', '50'))
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Incrementally translate CMS content, skipping sections that are up to date.
+
+Usage:
+    python -m content_build [--content-dir content] [--languages en,tr] [--dry-run]
+
+A manifest (content/.build.json) records, per section and language, the
+SHA-256 of the source the translation was built from (body and front
+matter, which translations copy) and of each of its paragraphs, of the
+translated file, and of the translation memory entries it used. A
+translation is rebuilt only when:
+
+  changed_source   the default-language section's body or front matter changed
+  missing_output   the translated file does not exist
+  memory_updated   a translation memory entry for one of its paragraphs changed
+
+Translated files without a manifest entry, or edited since they were built,
+are hand-written or hand-corrected: they are adopted (their hashes recorded)
+instead of being overwritten. Before a translation is rebuilt, its current
+paragraphs are put into the translation memory under the source paragraphs
+they were built from, so only the paragraphs whose source changed are
+translated again and hand edits to the others survive. That needs the
+translation to have as many paragraphs as its source had; otherwise the
+whole section is translated again.
+
+Commit content/.build.json together with the translations, so fresh
+checkouts and deploys start from it. The translation memory
+(content/translation_memory.sqlite3) need not persist: it is seeded from
+the committed translations as above, and an empty memory never marks
+anything stale. Unchanged sections make no translator calls, so the
+command is safe to run on every deploy. It exits non-zero if any
+translation failed.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from cms import ContentManager, segment_key, split_segments
+from translation import FakeBackend, GoogleBackend
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+MANIFEST_FILE = '.build.json'
+MANIFEST_VERSION = 3
+
+
+def build(manager: ContentManager, languages: Optional[Iterable[str]] = None,
+          dry_run: bool = False, max_workers: int = 4) -> Dict:
+    """Translate stale (section, language) pairs and update the manifest"""
+    if languages is None:
+        languages = [l for l in manager.supported_languages if l != manager.default_language]
+    languages = list(languages)
+    manifest_path = os.path.join(manager.content_dir, MANIFEST_FILE)
+
+    with _build_lock(manifest_path):
+        manifest = _load_manifest(manifest_path)
+        sections = {s['section'] for s in manager.list_sections()}
+        report = {'sections': len(sections), 'rebuilt': 0, 'skipped': 0, 'adopted': 0,
+                  'stale': {}, 'failed': [], 'dry_run': dry_run}
+
+        stale = []
+        for section in sorted(sections):
+            source = manager.get_content(section)
+            if source is None:
+                continue
+            source_hash = _source_sha256(source)
+            built = manifest.setdefault(section, {})
+            for language in languages:
+                output_hash = _file_sha256(_output_path(manager, section, language))
+                entry = built.get(language)
+                if output_hash is not None and (
+                        entry is None or entry.get('output_sha256') != output_hash):
+                    built[language] = {
+                        'source_sha256': source_hash,
+                        'source_segments': _segment_keys(source['content']),
+                        'output_sha256': output_hash,
+                        # Never rebuilt for memory changes (see _stale_reason)
+                        'memory_sha256': None
+                    }
+                    report['adopted'] += 1
+                    continue
+
+                reason = _stale_reason(manager, language, source_hash, output_hash,
+                                       source['content'], entry)
+                if reason is None:
+                    report['skipped'] += 1
+                else:
+                    stale.append((section, language, source_hash, source['content']))
+                    report['stale'][reason] = report['stale'].get(reason, 0) + 1
+
+        # Sections deleted from the default language
+        for section in set(manifest) - sections:
+            del manifest[section]
+
+        if not dry_run and stale:
+            sources = {(s, l): (h, text) for s, l, h, text in stale}
+            for section, language in sources:
+                _seed_memory(manager, section, language, manifest[section].get(language))
+            result = manager.translate_all(
+                tasks=list(sources), max_workers=max_workers)
+            failed = {(f['section'], f['language']) for f in result['failed']}
+            report['failed'] = result['failed']
+            for (section, language), (source_hash, text) in sources.items():
+                if (section, language) in failed:
+                    manifest[section].pop(language, None)
+                    continue
+                manifest[section][language] = {
+                    'source_sha256': source_hash,
+                    'source_segments': _segment_keys(text),
+                    'output_sha256': _file_sha256(_output_path(manager, section, language)),
+                    'memory_sha256': _memory_digest(manager, language, text)
+                }
+                report['rebuilt'] += 1
+
+        if not dry_run:
+            _save_manifest(manifest_path, manifest)
+    return report
+
+
+def _stale_reason(manager: ContentManager, language: str, source_hash: str,
+                  output_hash: Optional[str], source_text: str,
+                  built: Optional[Dict]) -> Optional[str]:
+    if output_hash is None:
+        return 'missing_output'
+    if built.get('source_sha256') != source_hash:
+        return 'changed_source'
+    # Adopted translations did not come from the memory, and an empty or
+    # missing memory (a fresh checkout) says nothing about what changed
+    if built.get('memory_sha256') is not None:
+        digest = _memory_digest(manager, language, source_text)
+        if digest is not None and digest != built['memory_sha256']:
+            return 'memory_updated'
+    return None
+
+
+def _seed_memory(manager: ContentManager, section: str, language: str,
+                 built: Optional[Dict]):
+    """Store a translation's paragraphs under the source paragraphs it was built from"""
+    if not built or not built.get('source_segments'):
+        return
+    try:
+        current = manager.get_content(section, language)
+    except Exception as e:
+        print(f'[content_build] Not reusing {section} ({language}): {e}', file=sys.stderr)
+        return
+    if current is None:
+        return
+    paragraphs = list(split_segments(current['content'])[1].values())
+    # Paragraphs only line up if the translation kept the source's structure
+    if len(paragraphs) == len(built['source_segments']):
+        manager.translation_memory.put_many(
+            language, zip(built['source_segments'], paragraphs))
+
+
+def _memory_digest(manager: ContentManager, language: str, text: str) -> Optional[str]:
+    """Hash of the stored translations of the text's paragraphs, in order,
+    or None if the memory holds none of them"""
+    keys = _segment_keys(text)
+    stored = manager.translation_memory.get_many(language, keys)
+    if not stored:
+        return None
+    digest = hashlib.sha256()
+    for key in keys:
+        digest.update(key.encode('ascii'))
+        digest.update(stored.get(key, '').encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _source_sha256(source: Dict) -> str:
+    """Hash of a section's body and of the front matter copied into translations"""
+    data = json.dumps({'content': source['content'], 'metadata': source['metadata']},
+                      sort_keys=True, ensure_ascii=False, default=str)
+    return _sha256(data.encode('utf-8'))
+
+
+def _segment_keys(text: str) -> List[str]:
+    return [segment_key(segment) for segment in split_segments(text)[1].values()]
+
+
+def _output_path(manager: ContentManager, section: str, language: str) -> str:
+    return os.path.join(manager.content_dir, language, f'{section}.md')
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return _sha256(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _load_manifest(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('version') == MANIFEST_VERSION:
+            return stored['sections']
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, AttributeError) as e:
+        print(f'[content_build] Ignoring unreadable manifest {path}: {e}', file=sys.stderr)
+    return {}
+
+
+def _save_manifest(path: str, manifest: Dict[str, Dict]):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'sections': manifest}, f,
+                      indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def _build_lock(manifest_path: str):
+    """One build at a time, e.g. when several instances deploy together"""
+    if fcntl is None:
+        yield
+        return
+    with open(f'{manifest_path}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--content-dir', default=os.environ.get('CONTENT_DIR', 'content'))
+    parser.add_argument('--languages', help='comma-separated target languages')
+    parser.add_argument('--backend', choices=('google', 'fake'), default='google')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--dry-run', action='store_true',
+                        help='report stale translations without building them')
+    args = parser.parse_args(argv)
+
+    backend = FakeBackend() if args.backend == 'fake' else GoogleBackend()
+    manager = ContentManager(args.content_dir, translator=backend)
+    languages = [l for l in args.languages.split(',') if l] if args.languages else None
+    if languages and set(languages) - set(manager.supported_languages):
+        parser.error(f'supported languages: {", ".join(manager.supported_languages)}')
+
+    report = build(manager, languages, dry_run=args.dry_run, max_workers=args.workers)
+    stale = ', '.join(f'{n} {reason}' for reason, n in sorted(report['stale'].items()))
+    print(f"[content_build] {report['sections']} sections: "
+          f"{report['rebuilt']} rebuilt, {report['skipped']} up to date, "
+          f"{report['adopted']} adopted, {len(report['failed'])} failed"
+          + (f" (stale: {stale})" if stale else '')
+          + (' [dry run]' if args.dry_run else ''))
+    for failure in report['failed']:
+        print(f"[content_build] {failure['section']} ({failure['language']}): "
+              f"{failure['error']}", file=sys.stderr)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
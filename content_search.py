@@ -0,0 +1,220 @@
+import re
+import math
+import html
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words, including the combining marks inside them (Arabic harakat,
+# decomposed accents), which \w alone would split words at
+WORD_RE = re.compile(r'(?:\w|[\u0300-\u036f\u0610-\u061a\u064b-\u065f\u0670])+')
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# Dotted and dotless capital I lower-case differently in Turkish
+TURKISH_CAPITALS = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Letter variants Arabic writers use interchangeably, tatweel, and digits
+ARABIC_FOLD = str.maketrans({
+    'ى': 'ي', 'ة': 'ه', 'ٱ': 'ا', 'ـ': None,
+    **{chr(0x0660 + d): str(d) for d in range(10)},
+    **{chr(0x06F0 + d): str(d) for d in range(10)}
+})
+
+# Marks that make a separate letter rather than an accent (Russian й)
+KEPT_MARKS = {'ru': '\u0306'}
+
+EXACT, PREFIX = 2, 1
+TITLE_WEIGHT = 3
+SNIPPET_CHARS = 80
+
+
+@lru_cache(maxsize=65536)
+def fold(word: str, language: str) -> str:
+    """Search form of a word: case, diacritics and spelling variants removed
+
+    Umlauts, Cyrillic ё and Arabic harakat and hamza carriers fold to their
+    base letters, so queries typed without them still match. Turkish
+    dotless ı is folded to i for the same reason.
+    """
+    if language == 'tr':
+        word = word.translate(TURKISH_CAPITALS)
+    kept = KEPT_MARKS.get(language, '')
+    word = unicodedata.normalize('NFKD', word.casefold())
+    word = ''.join(c for c in word if not unicodedata.combining(c) or c in kept)
+    word = unicodedata.normalize('NFC', word).replace('ı', 'i')
+    if language == 'ar':
+        word = word.translate(ARABIC_FOLD)
+    return word
+
+
+def tokenize(text: str, language: str) -> List[str]:
+    return [w for w in (fold(m, language) for m in WORD_RE.findall(text)) if w]
+
+
+def plain_text(rendered: str) -> str:
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', rendered))).strip()
+
+
+class ContentIndex:
+    """Inverted word index over CMS sections, one per language
+
+    Documents are the sections' rendered text plus their title. Scores are
+    match strength (exact word or prefix) times a log-scaled term frequency
+    times inverse document frequency, tripled for title words, summed over
+    query words; every query word has to match. Each search first checks
+    the language directory's (mtime, size) stamps and reindexes only the
+    sections that changed, so edits by any worker are picked up.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._lock = threading.RLock()
+        # language -> section -> document
+        self._docs: Dict[str, Dict[str, Dict]] = {}
+        # language -> word -> sections
+        self._postings: Dict[str, Dict[str, Set[str]]] = {}
+        self._vocabulary: Dict[str, List[str]] = {}
+
+    def build(self):
+        """Index every language, from the manager's render cache where warm"""
+        for language in self.manager.supported_languages:
+            with self._lock:
+                self._refresh(language)
+
+    def discard(self, section: str, language: str):
+        """Drop a section; it is reindexed by the next search"""
+        with self._lock:
+            doc = self._docs.get(language, {}).pop(section, None)
+            if doc is None:
+                return
+            postings = self._postings[language]
+            for word in doc['counts']:
+                sections = postings.get(word)
+                if sections is not None:
+                    sections.discard(section)
+                    if not sections:
+                        del postings[word]
+            self._vocabulary.pop(language, None)
+
+    def search(self, query: str, language: str, limit: int = 10) -> Tuple[int, List[Dict]]:
+        """Ranked section hits with snippets, and the total hit count"""
+        tokens = list(dict.fromkeys(tokenize(query, language)))
+        if not tokens:
+            return 0, []
+
+        with self._lock:
+            self._refresh(language)
+            docs = self._docs.get(language, {})
+            scores: Optional[Dict[str, float]] = None
+            for token in tokens:
+                token_scores = self._score_token(token, language)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {s: v + token_scores[s] for s, v in scores.items()
+                              if s in token_scores}
+                if not scores:
+                    return 0, []
+
+            ranked = sorted(scores.items(), key=lambda hit: (-hit[1], hit[0]))
+            return len(ranked), [
+                {
+                    'section': section,
+                    'title': docs[section]['title'],
+                    'score': round(score, 3),
+                    'snippet': snippet(docs[section]['text'], tokens, language)
+                }
+                for section, score in ranked[:limit]
+            ]
+
+    def _refresh(self, language: str):
+        stamps = self.manager.section_stamps(language)
+        docs = self._docs.setdefault(language, {})
+        for section in set(docs) - set(stamps):
+            self.discard(section, language)
+        for section, stamp in stamps.items():
+            doc = docs.get(section)
+            if doc is None or doc['stamp'] != stamp:
+                self.discard(section, language)
+                self._add(section, language, stamp)
+
+    def _add(self, section: str, language: str, stamp: Tuple[int, int]):
+        try:
+            content = self.manager.get_content(section, language)
+        except Exception as e:
+            # Kept without words, so it is retried only once the file changes
+            logger.error(f"Not indexing unreadable section {section} ({language}): {e}")
+            self._docs[language][section] = {
+                'stamp': stamp, 'title': section, 'text': '',
+                'counts': Counter(), 'title_words': set()
+            }
+            return
+        if content is None:
+            return
+        title = str(content['metadata'].get('title') or section)
+        text = plain_text(content['html'])
+        title_words = set(tokenize(title, language))
+        counts = Counter(tokenize(text, language))
+        counts.update(title_words - set(counts))
+
+        self._docs[language][section] = {
+            'stamp': stamp,
+            'title': title,
+            'text': text,
+            'counts': counts,
+            'title_words': title_words
+        }
+        postings = self._postings.setdefault(language, {})
+        for word in counts:
+            postings.setdefault(word, set()).add(section)
+        self._vocabulary.pop(language, None)
+
+    def _matching_words(self, token: str, language: str) -> Dict[str, int]:
+        vocabulary = self._vocabulary.get(language)
+        if vocabulary is None:
+            vocabulary = self._vocabulary[language] = sorted(self._postings.get(language, {}))
+        words = {}
+        i = bisect_left(vocabulary, token)
+        while i < len(vocabulary) and vocabulary[i].startswith(token):
+            words[vocabulary[i]] = EXACT if vocabulary[i] == token else PREFIX
+            i += 1
+        return words
+
+    def _score_token(self, token: str, language: str) -> Dict[str, float]:
+        """Best score per section for one query word"""
+        docs = self._docs[language]
+        postings = self._postings.get(language, {})
+        best: Dict[str, float] = {}
+        for word, strength in self._matching_words(token, language).items():
+            sections = postings[word]
+            idf = math.log(1 + len(docs) / len(sections))
+            for section in sections:
+                doc = docs[section]
+                score = strength * (1 + math.log(doc['counts'][word])) * idf
+                if word in doc['title_words']:
+                    score *= TITLE_WEIGHT
+                if score > best.get(section, 0):
+                    best[section] = score
+        return best
+
+
+def snippet(text: str, tokens: List[str], language: str) -> str:
+    """Text around the first word matching a query word"""
+    for match in WORD_RE.finditer(text):
+        word = fold(match.group(), language)
+        if any(word.startswith(token) for token in tokens):
+            start = max(0, match.start() - SNIPPET_CHARS // 2)
+            end = min(len(text), start + SNIPPET_CHARS)
+            start = max(0, end - SNIPPET_CHARS)
+            return ''.join((
+                '…' if start > 0 else '',
+                text[start:end].strip(),
+                '…' if end < len(text) else ''
+            ))
+    return text[:SNIPPET_CHARS] + ('…' if len(text) > SNIPPET_CHARS else '')
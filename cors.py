@@ -0,0 +1,68 @@
+from typing import Iterable
+
+from config import Config
+
+ALLOW_METHODS = 'GET, POST, PUT, DELETE, OPTIONS'
+ALLOW_HEADERS = 'Content-Type, Authorization, X-Profile'
+EXPOSE_HEADERS = 'Content-Type, Authorization, X-Profile-File'
+
+
+class CORSMiddleware:
+    """WSGI middleware that answers preflights and adds CORS headers
+
+    Preflight requests are answered before Flask routes or dispatches them.
+    The origin check is a frozenset lookup and every header value is built
+    once at startup.
+    """
+
+    def __init__(self, wsgi_app, origins: Iterable[str], max_age: int):
+        self.wsgi_app = wsgi_app
+        self.origins = frozenset(o.strip() for o in origins if o.strip())
+        self.preflight_headers = [
+            ('Access-Control-Allow-Methods', ALLOW_METHODS),
+            ('Access-Control-Allow-Headers', ALLOW_HEADERS),
+            ('Access-Control-Allow-Credentials', 'true'),
+            ('Access-Control-Max-Age', str(max_age)),
+        ]
+        self.response_headers = [
+            ('Access-Control-Allow-Credentials', 'true'),
+            ('Access-Control-Expose-Headers', EXPOSE_HEADERS),
+        ]
+
+    def __call__(self, environ, start_response):
+        origin = environ.get('HTTP_ORIGIN')
+        if origin is None:
+            return self.wsgi_app(environ, start_response)
+
+        allowed = origin in self.origins
+        if (environ.get('REQUEST_METHOD') == 'OPTIONS'
+                and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in environ):
+            headers = [('Vary', 'Origin'), ('Content-Length', '0')]
+            if allowed:
+                headers += [('Access-Control-Allow-Origin', origin)]
+                headers += self.preflight_headers
+            start_response('204 No Content', headers)
+            return [b'']
+
+        def cors_start_response(status, headers, exc_info=None):
+            _add_vary_origin(headers)
+            if allowed:
+                headers.append(('Access-Control-Allow-Origin', origin))
+                headers.extend(self.response_headers)
+            return start_response(status, headers, exc_info)
+
+        return self.wsgi_app(environ, cors_start_response)
+
+
+def _add_vary_origin(headers: list):
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == 'vary':
+            headers[i] = (name, f'{value}, Origin')
+            return
+    headers.append(('Vary', 'Origin'))
+
+
+def init_cors(app):
+    """Wrap the Flask WSGI app with the CORS middleware"""
+    app.wsgi_app = CORSMiddleware(
+        app.wsgi_app, Config.CORS_ORIGINS, Config.CORS_MAX_AGE)
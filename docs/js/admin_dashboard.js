@@ -76,6 +76,7 @@
       show(dashboard);
       await loadEvents();
       await loadParticipants();
+      subscribeToUpdates();
     } catch (err) {
       loginError.textContent = err.message;
       show(loginError);
@@ -165,10 +166,24 @@
     reader.readAsDataURL(file);
   }
 
+  // /api/participants is paginated: follow next_cursor until the last page,
+  // so the table and the CSV export built from it hold every participant
+  async function fetchAllParticipants() {
+    const all = [];
+    let cursor = null;
+    do {
+      const query = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+      const page = await api(`/api/participants?limit=500${query}`);
+      all.push(...page.participants);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return all;
+  }
+
   async function loadParticipants() {
     participantsTbody.innerHTML = "Loading...";
     try {
-      const { participants } = await api("/api/participants");
+      const participants = await fetchAllParticipants();
       participantsTbody.innerHTML = "";
       participants.forEach((p) => {
         const tr = document.createElement("tr");
@@ -220,9 +235,9 @@
   async function loadParticipantsByEvent(eventId) {
     participantsTbody.innerHTML = "Loading...";
     try {
-      let endpoint = "/api/participants"; // fallback global
-      if (eventId) endpoint = `/api/events/${eventId}/participants`;
-      const { participants } = await api(endpoint);
+      const participants = eventId
+        ? (await api(`/api/events/${eventId}/participants`)).participants
+        : await fetchAllParticipants();
       participantsTbody.innerHTML = "";
       participants.forEach((p) => {
         const tr = document.createElement("tr");
@@ -247,6 +262,28 @@
     window.open(url, "_blank");
   }
 
+  // Live updates: the server pushes participant counts and event changes
+  let eventStream = null;
+  let refreshTimer = null;
+
+  function scheduleRefresh(fn) {
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(fn, 500);
+  }
+
+  function subscribeToUpdates() {
+    if (eventStream || !window.EventSource) return;
+    eventStream = new EventSource(`${API_BASE}/api/events/stream`);
+    eventStream.addEventListener("participants", (e) => {
+      const { event_id } = JSON.parse(e.data);
+      const selectedId = eventSelect ? eventSelect.value : "";
+      if (!selectedId || String(event_id) === selectedId) {
+        scheduleRefresh(() => loadParticipantsByEvent(selectedId || null));
+      }
+    });
+    eventStream.addEventListener("event", () => scheduleRefresh(loadEvents));
+  }
+
   // Event bindings
   loginBtn?.addEventListener("click", handleLogin);
   createEventBtn?.addEventListener("click", createEvent);
@@ -265,5 +302,6 @@
     loadParticipants();
     populateEventSelect();
     loadParticipantsByEvent(null);
+    subscribeToUpdates();
   }
 })();
\ No newline at end of file
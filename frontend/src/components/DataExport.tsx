@@ -9,7 +9,7 @@ const DataExport: React.FC = () => {
   useEffect(() => {
     async function fetchEvents() {
       try {
-        const res = await authFetch('/api/events', { skipAuth: true });
+        const res = await authFetch('/api/events?fields=id,title', { skipAuth: true });
         const json = await res.json();
         setEvents(json.events);
       } catch (err) {
@@ -1,5 +1,7 @@
 from bs4 import BeautifulSoup
+from bs4.element import PreformattedString
 from deep_translator import GoogleTranslator
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
 import json
@@ -18,37 +20,95 @@ LANGUAGES = {
 # Ausgangsdatei (Deutsch)
 INPUT_FILE = "index.html"
 
+# Persistenter Übersetzungs-Cache, damit wiederholte Builds kaum Anfragen stellen
+CACHE_FILE = "lang/translation_cache.json"
+
+# Google akzeptiert höchstens 5000 Zeichen pro Anfrage
+MAX_BATCH_CHARS = 4500
+MAX_BATCH_ITEMS = 100
+
 
 def clean_text(text):
     """Remove unnecessary whitespace and clean text for translation."""
     return re.sub(r'\s+', ' ', text).strip()
 
 
-def translate_text(text, target_lang):
-    try:
-        # Skip very short or non-text content
-        if len(text.strip()) < 2 or not re.search(r'[a-zA-Z]', text):
-            return text
+def needs_translation(text):
+    """Skip very short or non-text content"""
+    return len(text) >= 2 and re.search(r'[a-zA-Z]', text) is not None
+
 
-        # Clean text before translation
-        cleaned_text = clean_text(text)
+def load_cache():
+    """Load the persistent translation cache: {lang: {source text: translation}}"""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable translation cache {CACHE_FILE}: {e}")
+        return {}
+
+
+def save_cache(cache):
+    """Write the cache atomically, so an interrupted build cannot corrupt it"""
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    tmp_file = f"{CACHE_FILE}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+def make_batches(texts):
+    """Group texts into requests below Google's size limit"""
+    batch, size = [], 0
+    for text in texts:
+        if batch and (size + len(text) + 1 > MAX_BATCH_CHARS or len(batch) >= MAX_BATCH_ITEMS):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def translate_batch(translator, batch, target):
+    """Translate texts in one request, joined by newlines
+
+    Falls back to one request per text if the translation does not come back
+    with one line per text. Texts that fail keep their original wording.
+    """
+    if len(batch) > 1:
+        try:
+            lines = translator.translate('\n'.join(batch)).split('\n')
+            if len(lines) == len(batch):
+                return [line.strip() for line in lines], 1
+        except Exception as e:
+            print(f"Batch translation error ({len(batch)} texts): "
+                  f"{target} --> {str(e)}")
 
-        # Attempt translation with error handling
+    translations = []
+    for text in batch:
         try:
-            translated = GoogleTranslator(
-                source='auto', target=target_lang).translate(cleaned_text)
-            return translated
+            translations.append(translator.translate(text))
         except Exception as e:
-            print(
-                f"Translation error for '{text}': {target_lang} --> {str(e)}")
-            return text  # Return original text if translation fails
-    except Exception as e:
-        print(f"Unexpected error translating '{text}': {str(e)}")
-        return text
+            print(f"Translation error for '{text}': {target} --> {str(e)}")
+            translations.append(None)
+    return translations, len(batch)
 
 
-def translate_html_file(input_file, lang_code, lang_info):
-    """Translate an HTML file to the specified language."""
+def translate_html_file(input_file, lang_code, lang_info, cache=None):
+    """Translate an HTML file to the specified language.
+
+    All text nodes are collected first and each distinct text is translated
+    once, in batches, with one translator. Translations already in cache
+    (this language's part of the persistent cache) are reused, and new ones
+    are added to it. Returns counts for the summary.
+    """
+    if cache is None:
+        cache = {}
+    target = lang_info.get('code', lang_code)
+
     with open(input_file, 'r', encoding='utf-8') as f:
         html_content = f.read()
 
@@ -58,7 +118,7 @@ def translate_html_file(input_file, lang_code, lang_info):
     # Update the HTML language attribute
     html_tag = soup.find('html')
     if html_tag:
-        html_tag['lang'] = lang_info.get('code', lang_code)
+        html_tag['lang'] = target
 
     # Update language selector to reflect current language
     language_select = soup.find('select', {'id': 'language'})
@@ -71,15 +131,38 @@ def translate_html_file(input_file, lang_code, lang_info):
                 if 'selected' in option.attrs:
                     del option.attrs['selected']
 
-    # Translate text nodes while preserving structure
-    for tag in soup.find_all(text=True):
-        parent = tag.parent.name
-        if parent not in ['script', 'style']:  # Skip script and style tags
-            stripped = tag.strip()
-            if stripped and len(stripped) > 1:
-                translated = translate_text(
-                    stripped, lang_info.get('code', lang_code))
-                tag.replace_with(translated)
+    # Collect translatable text nodes, grouped by their cleaned text
+    nodes = {}
+    for tag in soup.find_all(string=True):
+        # Skip script and style tags, comments and the doctype
+        if tag.parent.name in ['script', 'style'] or isinstance(tag, PreformattedString):
+            continue
+        text = clean_text(tag)
+        if needs_translation(text):
+            nodes.setdefault(text, []).append(tag)
+
+    stats = {'nodes': sum(len(tags) for tags in nodes.values()), 'unique': len(nodes),
+             'cached': 0, 'translated': 0, 'requests': 0}
+    missing = [text for text in nodes if text not in cache]
+    stats['cached'] = len(nodes) - len(missing)
+
+    if missing:
+        translator = GoogleTranslator(source='auto', target=target)
+        for batch in make_batches(missing):
+            translations, requests = translate_batch(translator, batch, target)
+            stats['requests'] += requests
+            for text, translated in zip(batch, translations):
+                if translated:
+                    cache[text] = translated
+                    stats['translated'] += 1
+
+    # Replace text nodes while preserving structure and surrounding whitespace
+    for text, tags in nodes.items():
+        translated = cache.get(text, text)
+        for tag in tags:
+            leading = tag[:len(tag) - len(tag.lstrip())]
+            trailing = tag[len(tag.rstrip()):]
+            tag.replace_with(f"{leading}{translated}{trailing}")
 
     # Preserve CSS link
     css_link = soup.find('link', rel='stylesheet')
@@ -99,6 +182,7 @@ def translate_html_file(input_file, lang_code, lang_info):
     output_file = f"lang/{lang_code}.html"
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(str(soup))
+    return stats
 
 
 def generate_language_config():
@@ -129,17 +213,32 @@ def generate_language_config():
 def main():
     # Create the lang directory if it doesn't exist
     os.makedirs('lang', exist_ok=True)
+    cache = load_cache()
 
-    # Generate translations for each language
-    for lang_code, lang_info in LANGUAGES.items():
-        # Skip German (source language) and manually created languages
-        if lang_code == 'de' or lang_info.get('manual', False):
-            continue
+    # Skip German (source language) and manually created languages
+    targets = {
+        lang_code: lang_info for lang_code, lang_info in LANGUAGES.items()
+        if lang_code != 'de' and not lang_info.get('manual', False)
+    }
 
-        # Translate the HTML file
-        translate_html_file('index.html', lang_code, lang_info)
-        print(
-            f"✅ {lang_info['name'].capitalize()} translation saved → lang/{lang_code}.html")
+    # Translate all languages concurrently; each run only touches its own
+    # part of the cache
+    try:
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            runs = {
+                lang_code: pool.submit(translate_html_file, INPUT_FILE, lang_code, lang_info,
+                                       cache.setdefault(lang_code, {}))
+                for lang_code, lang_info in targets.items()
+            }
+            for lang_code, run in runs.items():
+                stats = run.result()
+                print(
+                    f"✅ {targets[lang_code]['name'].capitalize()} translation saved → "
+                    f"lang/{lang_code}.html ({stats['unique']} unique texts, "
+                    f"{stats['cached']} cached, {stats['translated']} translated "
+                    f"in {stats['requests']} requests)")
+    finally:
+        save_cache(cache)
 
     # Generate language configuration
     generate_language_config()
@@ -0,0 +1,10 @@
+import os
+
+# Threaded workers so long-lived /api/events/stream connections wait on a
+# shared condition instead of holding a whole sync worker each. Keep threads
+# comfortably above SSE_MAX_CLIENTS so API requests always find a thread.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
@@ -0,0 +1,156 @@
+import os
+import time
+import shutil
+import tempfile
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """Runs dependency checks on a background thread and caches the results
+
+    Readiness probes only read the cached results, so a probe costs the same
+    no matter how large the store is. Other modules can add their own checks
+    with register(); a check returns a dict that must contain an 'ok' key.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._checks: Dict[str, Callable[[], Dict]] = {}
+        self._results: Dict[str, Dict] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+
+    def register(self, name: str, check: Callable[[], Dict]):
+        """Add a named dependency check"""
+        self._checks[name] = check
+
+    def run_checks(self):
+        """Run every registered check once and publish the results"""
+        results = {}
+        for name, check in list(self._checks.items()):
+            started = time.perf_counter()
+            try:
+                result = dict(check())
+            except Exception as e:
+                logger.error(f"Health check {name} failed: {e}")
+                result = {'ok': False, 'error': str(e)}
+            result['check_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            results[name] = result
+
+        with self._lock:
+            self._results = results
+            self._checked_at = time.time()
+
+    def ensure_started(self):
+        """Start the background thread in this process (again after a fork)"""
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        self.run_checks()
+        self._thread = threading.Thread(
+            target=self._run, name='health-checker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_checks()
+
+    def snapshot(self) -> Tuple[bool, Dict]:
+        """Cached results and overall readiness"""
+        with self._lock:
+            results = self._results
+            checked_at = self._checked_at
+
+        if checked_at is None:
+            return False, {'status': 'starting', 'checks': {}}
+
+        age = time.time() - checked_at
+        # Stale results mean the checker thread itself is stuck
+        fresh = age <= self.interval * 3
+        ready = fresh and all(r.get('ok') for r in results.values())
+        return ready, {
+            'status': 'ready' if ready else 'not_ready',
+            'checked_at': datetime.utcfromtimestamp(checked_at).isoformat(),
+            'age_seconds': round(age, 2),
+            'checks': results
+        }
+
+
+checker = HealthChecker(Config.HEALTH_CHECK_INTERVAL)
+
+
+def register_check(name: str, check: Callable[[], Dict]):
+    """Register a readiness check on the shared checker"""
+    checker.register(name, check)
+
+
+def check_store() -> Dict:
+    """Events file is readable; a small write is timed next to it
+
+    The event count comes from the worker's store cache rather than from
+    parsing the file again.
+    """
+    path = Config.EVENTS_FILE
+    stat = os.stat(path)
+    if not os.access(path, os.R_OK):
+        return {'ok': False, 'readable': False, 'error': 'Events file is not readable'}
+
+    # A probe file per check, so workers checking at once never share one
+    started = time.perf_counter()
+    fd, probe_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix='.health_probe.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(datetime.utcnow().isoformat())
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        os.remove(probe_path)
+    write_ms = (time.perf_counter() - started) * 1000
+
+    cache = get_event_store().cache_info()
+    return {
+        'ok': write_ms <= Config.HEALTH_MAX_WRITE_MS,
+        'readable': True,
+        'events': cache['events'] if cache['warm'] else None,
+        'size_bytes': stat.st_size,
+        'write_latency_ms': round(write_ms, 2)
+    }
+
+
+def check_upload_disk() -> Dict:
+    """Upload folder is writable and has enough free space"""
+    usage = shutil.disk_usage(Config.UPLOAD_FOLDER)
+    writable = os.access(Config.UPLOAD_FOLDER, os.W_OK)
+    min_free = Config.HEALTH_MIN_FREE_DISK_MB * 1024 * 1024
+    return {
+        'ok': writable and usage.free >= min_free,
+        'writable': writable,
+        'free_bytes': usage.free,
+        'total_bytes': usage.total,
+        'min_free_bytes': min_free
+    }
+
+
+def get_event_store():
+    """Import event_store from app module"""
+    from app import event_store
+    return event_store
+
+
+register_check('store', check_store)
+register_check('upload_disk', check_upload_disk)
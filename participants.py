@@ -0,0 +1,251 @@
+import io
+import os
+import csv
+import gzip
+import json
+import logging
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from store import Unchanged
+
+logger = logging.getLogger(__name__)
+
+GZIP_TYPES = {'application/gzip', 'application/x-gzip'}
+
+# Accepted CSV headers (case-insensitive), including our own export's
+COLUMNS = {
+    'name': 'name',
+    'email': 'email',
+    'e-mail': 'email',
+    'message': 'message',
+    'nachricht': 'message',
+    'timestamp': 'timestamp'
+}
+
+
+class CSVImportError(ValueError):
+    """The upload as a whole could not be read; nothing is imported"""
+
+
+def validate_participant(data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Cleaned name, email and message, or an error message"""
+    name = str(data.get('name') or '').strip()
+    email = str(data.get('email') or '').strip()
+
+    if not name or not email:
+        return None, 'Name and email are required'
+
+    # Basic email validation
+    if '@' not in email or '.' not in email:
+        return None, 'Invalid email format'
+
+    return {
+        'name': name,
+        'email': email,
+        'message': str(data.get('message') or '').strip()
+    }, None
+
+
+class ImportReport:
+    """Accepted rows plus a bounded list of per-row errors"""
+
+    def __init__(self, max_errors: int = 100):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.accepted: List[Tuple[int, Dict]] = []
+        self.errors: List[Dict] = []
+        self.rejected = 0
+
+    def reject(self, line: int, message: str):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': line, 'error': message})
+
+    def to_dict(self) -> Dict:
+        return {
+            'rows': self.rows,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'errors_truncated': self.rejected > len(self.errors)
+        }
+
+
+def read_participant_csv(stream: IO[bytes], gzipped: bool = False,
+                         known_emails: Optional[Set[str]] = None,
+                         max_rows: int = 100000, max_errors: int = 100) -> ImportReport:
+    """Validate CSV rows one at a time without reading the whole upload
+
+    Emails in known_emails (casefolded) and repeats within the file are
+    rejected as duplicates. Row numbers in the report are CSV line numbers.
+    """
+    known_emails = set(known_emails or ())
+    report = ImportReport(max_errors)
+    binary = gzip.GzipFile(fileobj=stream, mode='rb') if gzipped else stream
+    text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+
+    try:
+        header = next(reader, None)
+        if header is None:
+            raise CSVImportError('CSV file is empty')
+        columns = {}
+        for i, title in enumerate(header):
+            key = COLUMNS.get(title.strip().casefold())
+            if key and key not in columns:
+                columns[key] = i
+        if 'name' not in columns or 'email' not in columns:
+            raise CSVImportError('CSV needs a header row with name and email columns')
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            report.rows += 1
+            if report.rows > max_rows:
+                raise CSVImportError(f'CSV has more than {max_rows} rows')
+
+            line = reader.line_num
+            data = {key: row[i] if i < len(row) else '' for key, i in columns.items()}
+            fields, error = validate_participant(data)
+            if error:
+                report.reject(line, error)
+                continue
+
+            email_key = fields['email'].casefold()
+            if email_key in known_emails:
+                report.reject(line, 'Email already registered')
+                continue
+
+            timestamp = data.get('timestamp', '').strip()
+            if timestamp:
+                try:
+                    datetime.fromisoformat(timestamp)
+                except ValueError:
+                    report.reject(line, 'Invalid timestamp')
+                    continue
+                fields['timestamp'] = timestamp
+
+            known_emails.add(email_key)
+            report.accepted.append((line, fields))
+
+    except (UnicodeDecodeError, csv.Error, OSError, EOFError) as e:
+        raise CSVImportError(f'Could not read CSV near line {reader.line_num + 1}: {e}')
+    finally:
+        text.detach()
+
+    return report
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 65536) -> Iterator[Any]:
+    """Items of a top-level JSON array, decoded without reading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if started and buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+        if started and buffer.startswith(']'):
+            return
+
+        item = end = None
+        if buffer:
+            if not started:
+                if not buffer.startswith('['):
+                    raise ValueError('Expected a JSON array')
+                buffer, started = buffer[1:], True
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                pass
+
+        # An item counts once the delimiter after it has arrived; a number
+        # at the end of the buffer may continue in the next chunk
+        if end is None or buffer[end:].lstrip()[:1] not in (',', ']'):
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer += chunk
+                continue
+            if end is None:
+                raise ValueError('Unexpected end of JSON array')
+
+        yield item
+        buffer = buffer[end:]
+
+
+def migrate_legacy_participants(store, path: str) -> Optional[Dict]:
+    """One-time streamed import of the legacy participants.json into events
+
+    Records are matched to events by event_id, validated like sign-ups and
+    skipped if the event already has the same email and timestamp. The file
+    is renamed to <path>.migrated after the commit, so later starts (and
+    other workers) do nothing; records that could not be placed stay there.
+    """
+    if not os.path.exists(path):
+        return None
+
+    report = {'migrated': 0, 'duplicates': 0, 'skipped': 0}
+    try:
+        with store.transaction() as events:
+            # FileNotFoundError if another worker migrated it meanwhile
+            with open(path, 'r', encoding='utf-8') as f:
+                by_id = {e.get('id'): e for e in events}
+                seen = {
+                    (p.get('email', '').casefold(), p.get('timestamp'))
+                    for e in events for p in e.get('participants', [])
+                }
+                for record in iter_json_array(f):
+                    if not isinstance(record, dict):
+                        report['skipped'] += 1
+                        continue
+                    fields, error = validate_participant(record)
+                    event_id = _legacy_event_id(record)
+                    if error or event_id not in by_id:
+                        report['skipped'] += 1
+                        continue
+
+                    timestamp = _normalize_timestamp(record.get('timestamp'))
+                    key = (fields['email'].casefold(), timestamp)
+                    if key in seen:
+                        report['duplicates'] += 1
+                        continue
+                    seen.add(key)
+
+                    by_id[event_id].setdefault('participants', []).append(
+                        dict(fields, timestamp=timestamp, event_id=event_id))
+                    report['migrated'] += 1
+            if not report['migrated']:
+                raise Unchanged()
+
+        os.replace(path, f'{path}.migrated')
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Legacy participant migration failed, will retry: {e}")
+        return None
+
+    logger.info(
+        f"Migrated {report['migrated']} legacy participants from {path} "
+        f"({report['duplicates']} duplicates, {report['skipped']} without a valid event)")
+    return report
+
+
+def _legacy_event_id(record: Dict) -> Optional[int]:
+    try:
+        return int(record.get('event_id', record.get('event')))
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_timestamp(value) -> str:
+    """Naive UTC ISO format, so timestamps sort as strings"""
+    if not value:
+        return ''
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return str(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import cProfile
+import pstats
+import logging
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+from flask import g, request, has_request_context
+from config import Config
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('slow_requests')
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_FLAG = 'profile'
+
+
+def init_profiling(app):
+    """Register the per-request profiling hook and the slow-request log"""
+    if Config.SLOW_REQUEST_LOG:
+        handler = logging.FileHandler(Config.SLOW_REQUEST_LOG, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        slow_logger.addHandler(handler)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.store_io_time = 0.0
+        if profiling_requested():
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def finish_request_timer(response):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            try:
+                response.headers['X-Profile-File'] = write_profile(profiler)
+            except OSError as e:
+                logger.error(f"Error writing profile: {e}")
+
+        started = g.get('request_started')
+        if started is not None:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= Config.SLOW_REQUEST_MS:
+                log_slow_request(response, duration_ms)
+        return response
+
+
+def profiling_requested() -> bool:
+    """Profile only when an admin explicitly asks for it on this request"""
+    flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_FLAG)
+    if flag not in ('1', 'true', 'yes'):
+        return False
+
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return False
+
+    from app import verify_token
+    return verify_token(auth_header[7:]) is not None
+
+
+@contextmanager
+def track_store_io():
+    """Accumulate time spent reading or writing the event store"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context() and 'store_io_time' in g:
+            g.store_io_time += time.perf_counter() - started
+
+
+def log_slow_request(response, duration_ms: float):
+    """Record a request that exceeded Config.SLOW_REQUEST_MS"""
+    record = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'method': request.method,
+        'route': request.url_rule.rule if request.url_rule else request.path,
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'store_io_ms': round(g.get('store_io_time', 0.0) * 1000, 2),
+        'request_bytes': request.content_length or 0,
+        'response_bytes': response.calculate_content_length(),
+    }
+    slow_logger.warning(json.dumps(record))
+
+
+def write_profile(profiler: cProfile.Profile) -> str:
+    """Write .prof and collapsed-stack files, returning the base file name"""
+    os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+
+    endpoint = (request.endpoint or 'unknown').replace('.', '_')
+    name = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{request.method}_{endpoint}"
+    base_path = os.path.join(Config.PROFILE_DIR, name)
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(f'{base_path}.prof')
+
+    with open(f'{base_path}.collapsed', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(collapsed_stacks(stats)))
+        f.write('\n')
+
+    logger.info(f"Wrote request profile: {base_path}.prof")
+    return name
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64,
+                     min_us: float = 1.0) -> List[str]:
+    """Approximate flamegraph stacks ("a;b;c <microseconds>") from cProfile data
+
+    cProfile only records caller/callee edges, so time for a function reached
+    through several callers is split in proportion to each edge's cumulative
+    time.
+    """
+    entries = stats.stats
+    callees: Dict[tuple, Dict[tuple, float]] = defaultdict(dict)
+    roots = []
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    folded: Counter = Counter()
+
+    def walk(func: tuple, stack: List[str], on_stack: set, scale: float):
+        _cc, _nc, tottime, _ct, _callers = entries[func]
+        stack = stack + [_frame_label(func)]
+        self_us = tottime * scale * 1e6
+        if self_us >= min_us:
+            folded[';'.join(stack)] += self_us
+        if len(stack) >= max_depth:
+            return
+
+        on_stack = on_stack | {func}
+        for callee, edge_cumtime in callees.get(func, {}).items():
+            callee_cumtime = entries[callee][3]
+            if callee in on_stack or not callee_cumtime:
+                continue
+            child_scale = scale * edge_cumtime / callee_cumtime
+            if callee_cumtime * child_scale * 1e6 >= min_us:
+                walk(callee, stack, on_stack, child_scale)
+
+    for root in roots:
+        walk(root, [], set(), 1.0)
+
+    return [f'{stack} {int(round(us))}' for stack, us in folded.most_common()]
+
+
+def _frame_label(func: tuple) -> str:
+    filename, lineno, name = func
+    if filename == '~':
+        return name
+    return f'{name} ({os.path.basename(filename)}:{lineno})'
+
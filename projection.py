@@ -0,0 +1,22 @@
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+Projection = Callable[[Dict], Dict]
+
+
+@lru_cache(maxsize=256)
+def compile_projection(fields: str) -> Optional[Projection]:
+    """Projection for a ?fields= value such as "id,title", or None for all fields
+
+    Parsing happens once per distinct value; repeated requests reuse the
+    cached function. Unknown field names are ignored.
+    """
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    if not names:
+        return None
+
+    if len(names) == 1:
+        name = names[0]
+        return lambda record: {name: record[name]} if name in record else {}
+
+    return lambda record: {name: record[name] for name in names if name in record}
@@ -0,0 +1,181 @@
+import re
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from store import StoreChange
+
+WORD_RE = re.compile(r'\w+')
+
+# Field weights and word match strengths used for ranking
+FIELD_WEIGHTS = (('name', 3), ('email', 2), ('message', 1))
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+# Most vocabulary words a single query word expands to by prefix or substring
+MAX_EXPANSIONS = 10000
+
+
+class ParticipantIndex:
+    """Inverted word index over participant name, email and message
+
+    Postings are compact arrays of document ids, kept per field and word. A
+    sorted vocabulary turns prefix queries into a binary search. Substring
+    queries (three characters or more) scan the vocabulary instead of the
+    participants. A query word expands to at most MAX_EXPANSIONS vocabulary
+    words, so very common prefixes stay cheap at the cost of completeness;
+    search() says when that cut a result short.
+    Scores come from the postings alone: field weight times match strength,
+    summed over query words. Documents are (event, position)
+    pairs that are resolved against the store's participant lists only for
+    the page being returned. The index is built on the first search and kept
+    current from the event store's diffs. Resets tombstone the event's
+    documents, and the index is compacted once tombstones outnumber live
+    entries.
+    """
+
+    def __init__(self, compact_min: int = 1000):
+        self.compact_min = compact_min
+        self._lock = threading.Lock()
+        self._source: Optional[List[Dict]] = None
+        self._participants: Dict[int, List[Dict]] = {}
+        self._built = False
+        self._reset_state()
+
+    def on_store_change(self, events: List[Dict],
+                        changes: Optional[List[StoreChange]]):
+        """Event store listener: drop the index on load, apply deltas on commit"""
+        with self._lock:
+            self._source = events
+            self._participants = {e.get('id'): e.get('participants', []) for e in events}
+            if changes is None or not self._built:
+                self._built = False
+                return
+
+            for change in changes:
+                if change.reset:
+                    self._remove_event(change.event_id)
+                first = len(self._participants.get(change.event_id, [])) - len(change.added)
+                for offset, participant in enumerate(change.added):
+                    self._add(change.event_id, first + offset, participant)
+
+            if self._tombstones > max(self.compact_min, len(self._doc_events) - self._tombstones):
+                self._built = False
+
+    def search(self, query: str, event_id: Optional[int] = None,
+               offset: int = 0, limit: int = 20) -> Tuple[int, List[Tuple[int, Dict]], bool]:
+        """Ranked (event_id, participant) matches, the total match count, and
+        whether MAX_EXPANSIONS left matches out of both"""
+        tokens = list(dict.fromkeys(WORD_RE.findall(query.casefold())))
+        if not tokens:
+            return 0, [], False
+
+        with self._lock:
+            self._ensure_built()
+            scored = [self._score_token(t) for t in tokens]
+            truncated = any(t for _, t in scored)
+            per_token = sorted((best for best, _ in scored), key=len)
+            scores = per_token[0]
+            for other in per_token[1:]:
+                scores = {d: s + other[d] for d, s in scores.items() if d in other}
+
+            doc_events = self._doc_events
+            hits = [
+                (score, doc_id) for doc_id, score in scores.items()
+                if doc_events[doc_id] is not None
+                and (event_id is None or doc_events[doc_id] == event_id)
+            ]
+            top = heapq.nsmallest(offset + limit, hits, key=lambda h: (-h[0], -h[1]))
+            return len(hits), [
+                (doc_events[doc_id],
+                 self._participants[doc_events[doc_id]][self._doc_positions[doc_id]])
+                for _, doc_id in top[offset:]
+            ], truncated
+
+    def _reset_state(self):
+        # Event id (None once tombstoned) and list position per document
+        self._doc_events: List[Optional[int]] = []
+        self._doc_positions = array('I')
+        self._event_docs: Dict[int, array] = {}
+        self._postings: List[Dict[str, array]] = [{} for _ in FIELD_WEIGHTS]
+        self._vocabulary: List[str] = []
+        self._known_words = set()
+        self._tombstones = 0
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        self._reset_state()
+        for event in self._source or []:
+            for position, participant in enumerate(event.get('participants', [])):
+                self._add(event.get('id'), position, participant, sort_vocabulary=False)
+        self._vocabulary.sort()
+        self._built = True
+
+    def _add(self, event_id: int, position: int, participant: Dict,
+             sort_vocabulary: bool = True):
+        doc_id = len(self._doc_events)
+        self._doc_events.append(event_id)
+        self._doc_positions.append(position)
+        self._event_docs.setdefault(event_id, array('I')).append(doc_id)
+
+        for postings, (field, _) in zip(self._postings, FIELD_WEIGHTS):
+            value = participant.get(field)
+            if not value:
+                continue
+            for word in set(WORD_RE.findall(str(value).casefold())):
+                word_postings = postings.get(word)
+                if word_postings is None:
+                    word_postings = postings[word] = array('I')
+                    if word not in self._known_words:
+                        self._known_words.add(word)
+                        if sort_vocabulary:
+                            insort(self._vocabulary, word)
+                        else:
+                            self._vocabulary.append(word)
+                word_postings.append(doc_id)
+
+    def _remove_event(self, event_id: int):
+        for doc_id in self._event_docs.pop(event_id, []):
+            if self._doc_events[doc_id] is not None:
+                self._doc_events[doc_id] = None
+                self._tombstones += 1
+
+    def _matching_words(self, token: str) -> Tuple[Dict[str, int], bool]:
+        """Vocabulary words matching token, with their match strength, and
+        whether MAX_EXPANSIONS cut the list short"""
+        vocabulary = self._vocabulary
+        words = {}
+        i = bisect_left(vocabulary, token)
+        while i < len(vocabulary) and vocabulary[i].startswith(token):
+            if len(words) >= MAX_EXPANSIONS:
+                return words, True
+            word = vocabulary[i]
+            words[word] = EXACT if word == token else PREFIX
+            i += 1
+        if len(token) >= 3:
+            for word in vocabulary:
+                if token in word and word not in words:
+                    if len(words) >= MAX_EXPANSIONS:
+                        return words, True
+                    words[word] = SUBSTRING
+        return words, False
+
+    def _score_token(self, token: str) -> Tuple[Dict[int, int], bool]:
+        """Best field weight x match strength per document for one query
+        word, and whether its expansion was truncated"""
+        matching, truncated = self._matching_words(token)
+        weighted = []
+        for word, strength in matching.items():
+            for postings, (_, weight) in zip(self._postings, FIELD_WEIGHTS):
+                if word in postings:
+                    weighted.append((strength * weight, postings[word]))
+
+        # Highest scores first, so later (lower) postings only fill gaps
+        weighted.sort(key=lambda w: w[0], reverse=True)
+        best: Dict[int, int] = {}
+        for score, postings in weighted:
+            for doc_id in postings:
+                if doc_id not in best:
+                    best[doc_id] = score
+        return best, truncated
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import logging
+import tempfile
+from array import array
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from columns import ParticipantColumns
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'KOSGESNP'
+VERSION = 1
+# Magic, format version, header length, CRC-32 of everything after the header
+PREAMBLE = struct.Struct('<8sIQI')
+
+STRING_COLUMNS = ('names', 'emails', 'messages')
+# Interned like ParticipantColumns.append() does
+INTERNED_COLUMNS = ('names', 'messages')
+
+Stamp = Tuple[int, int, int]
+
+
+def write_snapshot(path: str, events: List[Dict], source: Stamp):
+    """Write events as a columnar snapshot of the events.json with stamp source
+
+    Each string column is stored as a table of distinct values (lengths
+    plus one UTF-8 blob) and an index per participant. Timestamps are the
+    raw int64 column. Event fields and irregular records stay JSON. All
+    blocks are length-prefixed through the header's (offset, length)
+    pairs, so a reader can slice them straight out of a memory map.
+    """
+    blocks: List[bytes] = []
+    offset = 0
+
+    def add(data: bytes) -> List[int]:
+        nonlocal offset
+        blocks.append(data)
+        offset += len(data)
+        return [offset - len(data), len(data)]
+
+    described = []
+    for event in events:
+        fields = {k: v for k, v in event.items() if k != 'participants'}
+        participants = event.get('participants')
+        if participants is None:
+            described.append({'fields': fields, 'participants': None})
+            continue
+        if not isinstance(participants, ParticipantColumns):
+            participants = ParticipantColumns(event.get('id'), participants)
+
+        columns = {}
+        for name in STRING_COLUMNS:
+            table: Dict[str, int] = {}
+            index = array('I', (table.setdefault(value, len(table))
+                                for value in getattr(participants, name)))
+            columns[name] = {
+                'lengths': add(array('I', map(len, table)).tobytes()),
+                'text': add(''.join(table).encode('utf-8', 'surrogatepass')),
+                'index': add(index.tobytes())
+            }
+        columns['timestamps'] = add(participants.timestamps.tobytes())
+        columns['irregular'] = add(json.dumps(
+            participants.irregular, ensure_ascii=False).encode('utf-8', 'surrogatepass'))
+
+        described.append({
+            'fields': fields,
+            'participants': {
+                'event_id': participants.event_id,
+                'count': len(participants),
+                'columns': columns
+            }
+        })
+
+    header = json.dumps({
+        'byteorder': sys.byteorder,
+        'source': list(source),
+        'events': described
+    }, ensure_ascii=False).encode('utf-8')
+
+    crc = 0
+    for block in blocks:
+        crc = zlib.crc32(block, crc)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, len(header), crc))
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_snapshot(path: str, source: Optional[Stamp]) -> Optional[List[Dict]]:
+    """Events from the snapshot, or None if it is missing, stale or damaged"""
+    if source is None:
+        return None
+    try:
+        with open(path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _decode(view, source)
+            finally:
+                view.release()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, IndexError, TypeError, struct.error) as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+def _decode(view: memoryview, source: Stamp) -> Optional[List[Dict]]:
+    magic, version, header_length, crc = PREAMBLE.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        return None
+
+    start = PREAMBLE.size + header_length
+    header = json.loads(str(view[PREAMBLE.size:start], 'utf-8'))
+    if tuple(header['source']) != tuple(source) or header['byteorder'] != sys.byteorder:
+        return None
+    data = view[start:]
+    try:
+        if zlib.crc32(data) != crc:
+            raise ValueError('checksum mismatch')
+
+        def block(location: List[int]) -> memoryview:
+            block_offset, length = location
+            if block_offset + length > len(data):
+                raise ValueError('block out of range')
+            return data[block_offset:block_offset + length]
+
+        events = []
+        for described in header['events']:
+            event = dict(described['fields'])
+            participants = described['participants']
+            if participants is not None:
+                event['participants'] = _decode_participants(participants, block)
+            events.append(event)
+        return events
+    finally:
+        data.release()
+
+
+def _decode_participants(described: Dict, block) -> ParticipantColumns:
+    columns = described['columns']
+    values = {}
+    for name in STRING_COLUMNS:
+        lengths = array('I')
+        lengths.frombytes(block(columns[name]['lengths']))
+        text = str(block(columns[name]['text']), 'utf-8', 'surrogatepass')
+        bounds = list(accumulate(lengths, initial=0))
+        table = [text[a:b] for a, b in zip(bounds, bounds[1:])]
+        if name in INTERNED_COLUMNS:
+            table = list(map(sys.intern, table))
+        index = array('I')
+        index.frombytes(block(columns[name]['index']))
+        values[name] = list(map(table.__getitem__, index))
+
+    timestamps = array('q')
+    timestamps.frombytes(block(columns['timestamps']))
+    irregular = {
+        int(position): record for position, record in
+        json.loads(str(block(columns['irregular']), 'utf-8', 'surrogatepass')).items()
+    }
+
+    count = described['count']
+    if len(timestamps) != count or any(len(v) != count for v in values.values()):
+        raise ValueError('column lengths differ')
+    return ParticipantColumns.from_columns(
+        described['event_id'], values['names'], values['emails'], values['messages'],
+        timestamps, irregular)
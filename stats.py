@@ -0,0 +1,162 @@
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from columns import NO_TIMESTAMP, ParticipantColumns
+from store import StoreChange
+
+GRANULARITIES = {'hour': 3600, 'day': 86400}
+
+
+class BucketSeries:
+    """Sorted bucket keys with counts and running totals
+
+    Registrations arrive in time order, so an update almost always touches
+    the last bucket or appends a new one: O(1). A range query is two binary
+    searches over the keys plus one subtraction of running totals.
+    """
+
+    def __init__(self):
+        self.keys: List[int] = []
+        self.counts: List[int] = []
+        self.cumulative: List[int] = []
+
+    def add(self, key: int):
+        if self.keys and key == self.keys[-1]:
+            self.counts[-1] += 1
+            self.cumulative[-1] += 1
+        elif not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+            self.counts.append(1)
+            self.cumulative.append((self.cumulative[-1] if self.cumulative else 0) + 1)
+        else:
+            # Out-of-order timestamp: insert and fix the running totals after it
+            i = bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                self.counts[i] += 1
+            else:
+                self.keys.insert(i, key)
+                self.counts.insert(i, 1)
+                self.cumulative.insert(i, 0)
+            running = self.cumulative[i - 1] if i else 0
+            for j in range(i, len(self.keys)):
+                running += self.counts[j]
+                self.cumulative[j] = running
+
+    def range(self, start: Optional[int], end: Optional[int]):
+        """Index bounds of buckets with start <= key < end"""
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_left(self.keys, end)
+        return lo, hi
+
+    def total(self, lo: int, hi: int) -> int:
+        if hi <= lo:
+            return 0
+        return self.cumulative[hi - 1] - (self.cumulative[lo - 1] if lo else 0)
+
+
+class EventStats:
+    def __init__(self):
+        self.total = 0
+        self.undated = 0
+        self.series = {name: BucketSeries() for name in GRANULARITIES}
+
+    def add(self, participant: Dict):
+        self.add_epoch(parse_timestamp(participant.get('timestamp')))
+
+    def add_epoch(self, epoch: Optional[int]):
+        self.total += 1
+        if epoch is None:
+            self.undated += 1
+            return
+        for name, width in GRANULARITIES.items():
+            self.series[name].add(epoch // width)
+
+
+class RegistrationStats:
+    """Registrations per event, day and hour, kept current by the event store"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Dict[int, EventStats] = {}
+
+    def on_store_change(self, events: List[Dict],
+                        changes: Optional[List[StoreChange]]):
+        """Event store listener: rebuild on load, apply deltas on commit"""
+        with self._lock:
+            if changes is None:
+                self._events = {}
+                for event in events:
+                    self._rebuild(event.get('id'), event.get('participants', []))
+                return
+
+            by_id = {e.get('id'): e for e in events}
+            for change in changes:
+                if change.reset:
+                    event = by_id.get(change.event_id, {})
+                    self._rebuild(change.event_id, event.get('participants', []))
+                else:
+                    stats = self._events.setdefault(change.event_id, EventStats())
+                    for participant in change.added:
+                        stats.add(participant)
+
+    def query(self, event_id: Optional[int] = None, start: Optional[int] = None,
+              end: Optional[int] = None, granularity: str = 'day') -> List[Dict]:
+        """Counts for every bucket that overlaps epoch seconds [start, end)"""
+        width = GRANULARITIES[granularity]
+        start_key = None if start is None else start // width
+        end_key = None if end is None else -(-end // width)
+
+        with self._lock:
+            if event_id is None:
+                selected = sorted(self._events.items())
+            elif event_id in self._events:
+                selected = [(event_id, self._events[event_id])]
+            else:
+                selected = []
+
+            results = []
+            for eid, stats in selected:
+                series = stats.series[granularity]
+                lo, hi = series.range(start_key, end_key)
+                results.append({
+                    'event_id': eid,
+                    'total': stats.total,
+                    'range_total': series.total(lo, hi),
+                    'undated': stats.undated,
+                    'buckets': [
+                        {'start': _format_bucket(series.keys[i] * width),
+                         'count': series.counts[i]}
+                        for i in range(lo, hi)
+                    ]
+                })
+            return results
+
+    def _rebuild(self, event_id: int, participants: List[Dict]):
+        stats = EventStats()
+        if isinstance(participants, ParticipantColumns):
+            # Read the integer timestamp column instead of materialising dicts
+            for micros in participants.timestamps:
+                stats.add_epoch(None if micros == NO_TIMESTAMP else micros // 1000000)
+        else:
+            for participant in participants:
+                stats.add(participant)
+        self._events[event_id] = stats
+
+
+def parse_timestamp(value) -> Optional[int]:
+    """Epoch seconds for a stored ISO timestamp (naive values are UTC)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _format_bucket(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat()
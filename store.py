@@ -0,0 +1,268 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from columns import compact_participants, json_default
+from snapshot import read_snapshot, write_snapshot
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class StoreChange(NamedTuple):
+    """What changed for one event between two store revisions"""
+    event_id: int
+    # Participants appended since the previous revision (all of them on reset)
+    added: List[Dict]
+    # Participant list was cleared or replaced rather than appended to
+    reset: bool
+    # Event fields other than participants and updated_at changed
+    updated: bool
+
+
+class Unchanged(Exception):
+    """Raised inside EventStore.transaction() to leave without writing"""
+
+
+# Listeners receive the committed events and the changes; changes is None on
+# the first load, when listeners should build their state from scratch.
+StoreListener = Callable[[List[Dict], Optional[List[StoreChange]]], None]
+
+
+class EventStore:
+    """events.json with a per-process cache and atomic, locked writes
+
+    Every gunicorn worker keeps its own parsed copy of the file and re-reads
+    it only when the file's inode, mtime or size change. Participant lists
+    are cached as ParticipantColumns. Writes go to a temporary file that
+    replaces events.json, under an exclusive lock file shared by all
+    workers. Listeners are told about every change, whether
+    this worker committed it or picked it up from disk.
+
+    With snapshot=True every commit also writes a columnar snapshot next to
+    events.json. Reloads read it instead of parsing JSON when its recorded
+    stamp matches the current events.json. JSON stays the source of truth.
+    """
+
+    def __init__(self, path: str, snapshot: bool = False):
+        self.path = path
+        self.lock_path = f'{path}.lock'
+        self.snapshot_path = f'{path}.snapshot' if snapshot else None
+        self._lock = threading.RLock()
+        self._events: Optional[List[Dict]] = None
+        self._stamp = None
+        self._listeners: List[StoreListener] = []
+        self.revision = 0
+        self.hits = 0
+        self.reloads = 0
+        self.snapshot_loads = 0
+
+    def subscribe(self, listener: StoreListener):
+        """Register a listener; it is primed immediately if data is loaded"""
+        with self._lock:
+            self._listeners.append(listener)
+            if self._events is not None:
+                listener(self._events, None)
+
+    def load(self) -> List[Dict]:
+        """Current events; callers get their own copies to modify"""
+        with self._lock:
+            self._refresh()
+            return _copy_events(self._events)
+
+    def refresh(self) -> bool:
+        """Pick up changes written by other workers; True if reloaded"""
+        with self._lock:
+            return self._refresh()
+
+    def counts(self) -> Dict[int, int]:
+        """Participant count per event id without copying any data"""
+        with self._lock:
+            self._refresh()
+            return {e.get('id'): len(e.get('participants', [])) for e in self._events}
+
+    def save(self, events: List[Dict]) -> bool:
+        """Replace the stored events with the given list"""
+        try:
+            with self._lock, self._file_lock():
+                self._write(events)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving events: {e}")
+            return False
+
+    @contextmanager
+    def transaction(self):
+        """Read-modify-write under the cross-process lock
+
+        Yields a private copy of the latest events; it is written back when
+        the block exits normally and discarded if the block raises. Raising
+        Unchanged discards it too, but is not an error: nothing is written,
+        no listener is told, and execution continues after the block.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            events = _copy_events(self._events)
+            try:
+                yield events
+            except Unchanged:
+                return
+            self._write(events)
+
+    def cache_info(self) -> Dict:
+        with self._lock:
+            return {
+                'warm': self._events is not None,
+                'revision': self.revision,
+                'hits': self.hits,
+                'reloads': self.reloads,
+                'snapshot_loads': self.snapshot_loads,
+                'events': len(self._events or []),
+                'participants': sum(
+                    len(e.get('participants', [])) for e in self._events or [])
+            }
+
+    def _refresh(self) -> bool:
+        stamp = _file_stamp(self.path)
+        if self._events is not None and stamp == self._stamp:
+            self.hits += 1
+            return False
+
+        events = read_snapshot(self.snapshot_path, stamp) if self.snapshot_path else None
+        if events is not None:
+            self.snapshot_loads += 1
+        else:
+            events = self._load_json(stamp)
+
+        self.reloads += 1
+        self._stamp = stamp
+        self._publish(events)
+        return True
+
+    def _write(self, events: List[Dict]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(events, f, indent=2, ensure_ascii=False, default=json_default)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._stamp = _file_stamp(self.path)
+        committed = _copy_events(events)
+        self._write_snapshot(committed, self._stamp)
+        self._publish(committed)
+
+    def _load_json(self, stamp) -> List[Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                events = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            logger.error(f"Error loading events: {e}")
+            return []
+
+        for event in events:
+            if 'participants' in event:
+                event['participants'] = compact_participants(event)
+
+        # Leave a snapshot for the next reload, unless a writer got in first
+        if stamp is not None and stamp == _file_stamp(self.path):
+            self._write_snapshot(events, stamp)
+        return events
+
+    def _write_snapshot(self, events: List[Dict], stamp):
+        if not self.snapshot_path:
+            return
+        try:
+            write_snapshot(self.snapshot_path, events, stamp)
+        except Exception as e:
+            logger.error(f"Error writing snapshot {self.snapshot_path}: {e}")
+
+    def _publish(self, events: List[Dict]):
+        old = self._events
+        self._events = events
+        self.revision += 1
+        changes = None if old is None else diff_events(old, events)
+        if changes == []:
+            return
+        for listener in self._listeners:
+            try:
+                listener(events, changes)
+            except Exception as e:
+                logger.error(f"Store listener {listener!r} failed: {e}")
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _file_stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def diff_events(old: List[Dict], new: List[Dict]) -> List[StoreChange]:
+    """Per-event changes, assuming participants are only appended or reset"""
+    old_by_id = {e.get('id'): e for e in old}
+    changes = []
+    for event in new:
+        event_id = event.get('id')
+        before = old_by_id.get(event_id, {})
+        old_participants = before.get('participants', [])
+        new_participants = event.get('participants', [])
+
+        appended = (
+            len(new_participants) >= len(old_participants)
+            and (not old_participants
+                 or new_participants[len(old_participants) - 1] == old_participants[-1])
+        )
+        if appended:
+            added = new_participants[len(old_participants):]
+            reset = False
+        else:
+            added = list(new_participants)
+            reset = True
+
+        updated = _event_fields(before) != _event_fields(event)
+        if added or reset or updated:
+            changes.append(StoreChange(event_id, added, reset, updated))
+    return changes
+
+
+def _event_fields(event: Dict) -> Dict:
+    return {k: v for k, v in event.items() if k not in ('participants', 'updated_at')}
+
+
+def _copy_events(events: List[Dict]) -> List[Dict]:
+    """Copy events and their participant lists, compacting plain lists"""
+    copies = []
+    for event in events:
+        copy = dict(event)
+        if 'participants' in copy:
+            copy['participants'] = compact_participants(event)
+        copies.append(copy)
+    return copies
@@ -0,0 +1,185 @@
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
+
+from store import EventStore, StoreChange
+
+logger = logging.getLogger(__name__)
+
+
+class StreamBroker:
+    """Fans store changes out to Server-Sent Events clients
+
+    One broker runs per worker. It listens to the event store and keeps a
+    short history of messages. While at least one client is connected, a
+    background thread polls the store for commits made by other workers.
+    Each client waits on a shared condition, so an idle dashboard costs a
+    blocked thread and no CPU.
+
+    Message ids are "<worker token>-<sequence>". A client that reconnects
+    with a Last-Event-ID this worker still has in its history gets the
+    missed messages replayed. Any other client gets a fresh snapshot.
+    """
+
+    def __init__(self, store: EventStore, history: int = 512,
+                 poll_interval: float = 1.0, heartbeat: float = 15.0,
+                 max_clients: int = 16, max_seconds: float = 300.0):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.max_clients = max_clients
+        self.max_seconds = max_seconds
+        self.token = uuid.uuid4().hex[:8]
+        self._history = deque(maxlen=history)
+        self._sequence = 0
+        self._clients = 0
+        self._cond = threading.Condition()
+        self._poller: Optional[threading.Thread] = None
+        store.subscribe(self._on_store_change)
+
+    @property
+    def clients(self) -> int:
+        return self._clients
+
+    def queue_depth(self) -> int:
+        """Messages currently buffered for replay"""
+        return len(self._history)
+
+    def publish(self, name: str, data: Dict):
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._cond:
+            self._sequence += 1
+            self._history.append((self._sequence, name, payload))
+            self._cond.notify_all()
+
+    def reserve(self) -> Optional[Callable[[], None]]:
+        """Take a client slot, unless max_clients are connected
+
+        Returns the function that gives the slot back. It may be called any
+        number of times (the stream ending, the response closing); only the
+        first call releases the slot.
+        """
+        with self._cond:
+            if self._clients >= self.max_clients:
+                return None
+            self._clients += 1
+        held = [True]
+
+        def release():
+            with self._cond:
+                if held[0]:
+                    held[0] = False
+                    self._clients -= 1
+        return release
+
+    def stream(self, release: Callable[[], None],
+               last_event_id: Optional[str] = None) -> Iterator[str]:
+        """SSE messages for one client until max_seconds have passed
+
+        release is the client's slot from reserve(), given back when the
+        stream ends. A generator that never starts (HEAD requests, clients
+        gone before the first message) never gets there, so the caller has
+        to release it when the response closes as well.
+        """
+        self._ensure_poller()
+        try:
+            yield f'retry: {int(self.poll_interval * 3000)}\n\n'
+
+            cursor = self._resume_cursor(last_event_id)
+            if cursor is None:
+                cursor = self._sequence
+                yield self._format(cursor, 'snapshot', json.dumps(self.snapshot()))
+
+            deadline = time.monotonic() + self.max_seconds
+            while time.monotonic() < deadline:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._sequence > cursor,
+                                        timeout=self.heartbeat)
+                    pending = [m for m in self._history if m[0] > cursor]
+                    missed = bool(self._history) and self._history[0][0] > cursor + 1
+
+                if missed:
+                    # Fell further behind than the history covers
+                    cursor = self._sequence
+                    yield self._format(cursor, 'snapshot', json.dumps(self.snapshot()))
+                elif pending:
+                    for sequence, name, payload in pending:
+                        yield self._format(sequence, name, payload)
+                    cursor = pending[-1][0]
+                else:
+                    yield ': heartbeat\n\n'
+        finally:
+            release()
+
+    def snapshot(self) -> Dict:
+        counts = self.store.counts()
+        return {
+            'events': [
+                {'event_id': event_id, 'count': count}
+                for event_id, count in counts.items()
+            ]
+        }
+
+    def _resume_cursor(self, last_event_id: Optional[str]) -> Optional[int]:
+        if not last_event_id:
+            return None
+        token, _, sequence = last_event_id.partition('-')
+        if token != self.token or not sequence.isdigit():
+            return None
+        cursor = int(sequence)
+        with self._cond:
+            oldest = self._history[0][0] if self._history else self._sequence + 1
+            if cursor > self._sequence or cursor < oldest - 1:
+                return None
+        return cursor
+
+    def _format(self, sequence: int, name: str, payload: str) -> str:
+        return f'id: {self.token}-{sequence}\nevent: {name}\ndata: {payload}\n\n'
+
+    def _on_store_change(self, events: List[Dict],
+                         changes: Optional[List[StoreChange]]):
+        if changes is None:
+            return
+
+        by_id = {e.get('id'): e for e in events}
+        for change in changes:
+            event = by_id.get(change.event_id, {})
+            if change.added or change.reset:
+                self.publish('participants', {
+                    'event_id': change.event_id,
+                    'count': len(event.get('participants', [])),
+                    'added': len(change.added),
+                    'reset': change.reset
+                })
+            if change.updated:
+                self.publish('event', {
+                    'event_id': change.event_id,
+                    'title': event.get('title', ''),
+                    'uploaded_image': event.get('uploaded_image', ''),
+                    'updated_at': event.get('updated_at')
+                })
+
+    def _ensure_poller(self):
+        with self._cond:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._poller = threading.Thread(
+                target=self._poll, name='sse-store-poller', daemon=True)
+            self._poller.start()
+
+    def _poll(self):
+        """Refresh the store while clients are connected, then exit"""
+        while True:
+            time.sleep(self.poll_interval)
+            with self._cond:
+                if self._clients == 0:
+                    self._poller = None
+                    return
+            try:
+                self.store.refresh()
+            except Exception as e:
+                logger.error(f"Error polling event store: {e}")
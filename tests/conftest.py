@@ -0,0 +1,61 @@
+"""Request-level tests against the app module, on throwaway data
+
+app.py builds its stores from Config at import time, so the environment
+is pointed at a temporary directory before anything imports it.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = tempfile.mkdtemp(prefix='kosge-tests-')
+CONTENT_DIR = os.path.join(DATA_DIR, 'content')
+shutil.copytree(os.path.join(ROOT, 'content'), CONTENT_DIR,
+                ignore=shutil.ignore_patterns('.index.json', 'translation_memory.sqlite3*'))
+
+os.environ.update({
+    'JWT_SECRET': 'test-secret',
+    'EVENTS_FILE': os.path.join(DATA_DIR, 'events.json'),
+    'PARTICIPANTS_FILE': os.path.join(DATA_DIR, 'participants.json'),
+    'UPLOAD_FOLDER': os.path.join(DATA_DIR, 'uploads'),
+    'PROFILE_DIR': os.path.join(DATA_DIR, 'profiles'),
+    'CONTENT_DIR': CONTENT_DIR,
+    'SLOW_REQUEST_MS': '1e9',
+    'HEALTH_CHECK_INTERVAL': '3600'
+})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app_module):
+    return {'Authorization': f"Bearer {app_module.generate_token('admin')}"}
+
+
+@pytest.fixture(autouse=True)
+def events(app_module):
+    """Four events without participants, saved fresh for every test"""
+    events = [
+        {'id': i, 'title': f'Event {i}', 'description': '', 'banner_url': '',
+         'default_image_url': '', 'uploaded_image': '', 'participants': [],
+         'created_at': '2024-01-01T00:00:00'}
+        for i in range(1, 5)
+    ]
+    app_module.save_events(events)
+    return events
@@ -0,0 +1,65 @@
+import os
+
+from config import Config
+
+
+def post_batch(client, auth_headers, operations):
+    return client.post('/api/batch', json={'operations': operations}, headers=auth_headers)
+
+
+def test_operations_apply_in_one_commit(client, auth_headers, app_module):
+    revision = app_module.event_store.revision
+    response = post_batch(client, auth_headers, [
+        {'op': 'update', 'event_id': 1, 'data': {'title': 'Renamed'}},
+        {'op': 'add-participant', 'event_id': 2,
+         'data': {'name': 'Anna', 'email': 'anna@example.org'}}
+    ])
+    assert response.status_code == 200
+    assert [r['op'] for r in response.get_json()['results']] == ['update', 'add-participant']
+
+    events = app_module.load_events()
+    assert events[0]['title'] == 'Renamed'
+    assert len(events[1]['participants']) == 1
+    assert app_module.event_store.revision == revision + 1
+
+
+def test_failing_operation_rolls_back_the_batch(client, auth_headers, app_module, events):
+    events[0]['uploaded_image'] = 'banner.png'
+    app_module.save_events(events)
+    upload = os.path.join(Config.UPLOAD_FOLDER, 'banner.png')
+    with open(upload, 'wb') as f:
+        f.write(b'png')
+    revision = app_module.event_store.revision
+
+    response = post_batch(client, auth_headers, [
+        {'op': 'update', 'event_id': 2, 'data': {'title': 'Renamed'}},
+        {'op': 'remove-image', 'event_id': 1},
+        {'op': 'add-participant', 'event_id': 3, 'data': {'name': 'Anna', 'email': 'nope'}}
+    ])
+    assert response.status_code == 400
+    assert response.get_json()['index'] == 2
+
+    events = app_module.load_events()
+    assert events[1]['title'] == 'Event 2'
+    assert events[0]['uploaded_image'] == 'banner.png'
+    assert app_module.event_store.revision == revision
+    assert os.path.exists(upload)
+    os.remove(upload)
+
+
+def test_operations_are_validated_before_anything_runs(client, auth_headers, app_module):
+    response = post_batch(client, auth_headers, [
+        {'op': 'update', 'event_id': 1, 'data': {'title': 'Renamed'}},
+        {'op': 'delete', 'event_id': 1}
+    ])
+    assert response.status_code == 400
+    assert response.get_json()['index'] == 1
+    assert app_module.load_events()[0]['title'] == 'Event 1'
+
+    too_many = [{'op': 'remove-image', 'event_id': 1}] * (Config.BATCH_MAX_OPERATIONS + 1)
+    assert post_batch(client, auth_headers, too_many).status_code == 400
+    assert post_batch(client, auth_headers, []).status_code == 400
+
+
+def test_requires_auth(client):
+    assert client.post('/api/batch', json={'operations': []}).status_code == 401
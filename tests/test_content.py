@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from tests.conftest import CONTENT_DIR
+
+
+@pytest.fixture
+def broken_section(app_module):
+    """A German section whose front matter is not valid YAML"""
+    path = os.path.join(CONTENT_DIR, 'de', 'broken.md')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('---\ntitle: [unclosed\n---\n\nKaputt.\n')
+    yield path
+    os.remove(path)
+
+
+def test_bundle_is_cacheable(client):
+    response = client.get('/api/content/de')
+    assert response.status_code == 200
+    assert response.headers['Content-Language'] == 'de'
+    assert 'vision' in response.get_json()['sections']
+
+    etag = response.headers['ETag']
+    revalidated = client.get('/api/content/de', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+
+
+def test_negotiated_bundle_varies_on_accept_language(client):
+    response = client.get('/api/content', headers={'Accept-Language': 'tr-TR,tr;q=0.9'})
+    assert response.status_code == 200
+    assert response.headers['Content-Language'] == 'tr'
+    assert 'Accept-Language' in response.headers['Vary']
+
+
+def test_unsupported_language(client):
+    assert client.get('/api/content?lang=xx').status_code == 404
+
+
+def test_bad_section_is_left_out(client, broken_section):
+    for url in ('/api/content?lang=de', '/api/content/de'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert list(response.get_json()['sections']) == ['vision']
+
+    response = client.get('/api/content/search?q=vision&lang=de')
+    assert response.status_code == 200
+    assert [hit['section'] for hit in response.get_json()['results']] == ['vision']
+
+    assert client.get('/api/content/de/broken').status_code == 500
+
+
+def test_bundle_failure_is_a_json_500(client, app_module, monkeypatch):
+    def fail(language):
+        raise OSError('disk gone')
+    monkeypatch.setattr(app_module.content_bundles, 'get', fail)
+
+    response = client.get('/api/content?lang=de')
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Failed to load content'}
+    assert 'Accept-Language' in response.headers['Vary']
@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+import content_build
+from cms import ContentManager
+from tests.conftest import ROOT
+from translation import FakeBackend
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    """The repository's content, without its manifest or translation memory"""
+    path = str(tmp_path / 'content')
+    shutil.copytree(os.path.join(ROOT, 'content'), path, ignore=shutil.ignore_patterns(
+        '.build.json*', '.index.json', 'translation_memory.sqlite3*'))
+    return path
+
+
+def build(content_dir):
+    backend = FakeBackend()
+    manager = ContentManager(content_dir, translator=backend)
+    return content_build.build(manager), backend
+
+
+def read(content_dir, language):
+    with open(os.path.join(content_dir, language, 'vision.md'), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_existing_translations_are_adopted(content_dir):
+    english = read(content_dir, 'en')
+    report, backend = build(content_dir)
+    assert (report['adopted'], report['rebuilt'], backend.calls) == (4, 0, 0)
+    assert read(content_dir, 'en') == english
+
+    report, backend = build(content_dir)
+    assert (report['skipped'], backend.calls) == (4, 0)
+
+
+def test_front_matter_change_rebuilds(content_dir):
+    build(content_dir)
+    source = read(content_dir, 'de').replace('title: Vision', 'title: Unsere Vision')
+    with open(os.path.join(content_dir, 'de', 'vision.md'), 'w', encoding='utf-8') as f:
+        f.write(source)
+
+    report, _ = build(content_dir)
+    assert report['stale'] == {'changed_source': 4}
+    assert 'title: Unsere Vision' in read(content_dir, 'en')
+
+
+def test_source_edit_keeps_hand_written_paragraphs(content_dir):
+    build(content_dir)
+    with open(os.path.join(content_dir, 'de', 'vision.md'), 'a', encoding='utf-8') as f:
+        f.write('\nNeuer Absatz.\n')
+
+    report, _ = build(content_dir)
+    assert report['rebuilt'] == 4
+    english = read(content_dir, 'en')
+    assert 'Hello.' in english
+    assert '[en] Neuer Absatz.' in english
+    assert '[en] Hallo.' not in english
@@ -0,0 +1,30 @@
+from config import Config
+
+ORIGIN = Config.CORS_ORIGINS[0]
+
+
+def test_preflight_is_answered_before_routing(client):
+    response = client.options('/api/events/1', headers={
+        'Origin': ORIGIN, 'Access-Control-Request-Method': 'PUT',
+        'Access-Control-Request-Headers': 'Authorization'})
+    assert response.status_code == 204
+    assert response.headers['Access-Control-Allow-Origin'] == ORIGIN
+    assert response.headers['Access-Control-Max-Age'] == str(Config.CORS_MAX_AGE)
+    assert 'PUT' in response.headers['Access-Control-Allow-Methods']
+    assert response.headers['Vary'] == 'Origin'
+
+
+def test_preflight_from_unknown_origin_gets_no_grant(client):
+    response = client.options('/api/events', headers={
+        'Origin': 'https://evil.example', 'Access-Control-Request-Method': 'GET'})
+    assert response.status_code == 204
+    assert 'Access-Control-Allow-Origin' not in response.headers
+
+
+def test_responses_carry_cors_headers(client):
+    response = client.get('/api/content/de', headers={'Origin': ORIGIN})
+    assert response.headers['Access-Control-Allow-Origin'] == ORIGIN
+    assert response.headers['Vary'].split(', ') == ['Origin']
+
+    negotiated = client.get('/api/content', headers={'Origin': ORIGIN})
+    assert set(negotiated.headers['Vary'].split(', ')) == {'Accept-Language', 'Origin'}
@@ -0,0 +1,38 @@
+import os
+import threading
+
+import health
+from config import Config
+
+
+def test_concurrent_store_checks_do_not_collide(app_module):
+    results, errors = [], []
+
+    def check():
+        try:
+            for _ in range(20):
+                results.append(health.check_store())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=check) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(r['ok'] and r['readable'] for r in results)
+    directory = os.path.dirname(os.path.abspath(Config.EVENTS_FILE))
+    assert not [name for name in os.listdir(directory) if name.startswith('.health_probe')]
+
+
+def test_store_check_counts_events_from_the_cache(app_module):
+    app_module.load_events()
+    assert health.check_store()['events'] == 4
+
+
+def test_readiness(client):
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    assert response.get_json()['checks']['store']['ok']
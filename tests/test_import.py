@@ -0,0 +1,89 @@
+import json
+
+import participants
+from participants import migrate_legacy_participants
+from store import EventStore
+
+
+def post_csv(client, auth_headers, body, event_id=1):
+    return client.post(f'/api/events/{event_id}/participants/import', data=body,
+                       headers=dict(auth_headers, **{'Content-Type': 'text/csv'}))
+
+
+def test_import_reports_rejected_rows(client, auth_headers, app_module):
+    body = ('name,email,timestamp\n'
+            'Anna,anna@example.org,2024-05-01T10:00:00\n'
+            'Bert,not-an-email,\n'
+            'Anna again,ANNA@example.org,\n'
+            'Cem,cem@example.org,yesterday\n')
+    response = post_csv(client, auth_headers, body)
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report['rows'], report['imported'], report['rejected']) == (4, 1, 3)
+    assert [e['row'] for e in report['errors']] == [3, 4, 5]
+    assert app_module.event_store.counts()[1] == 1
+
+
+def test_import_without_header_columns(client, auth_headers):
+    response = post_csv(client, auth_headers, 'vorname,mail\nAnna,anna@example.org\n')
+    assert response.status_code == 400
+
+
+def test_import_of_only_known_emails_writes_nothing(client, auth_headers, app_module):
+    body = 'name,email\nAnna,anna@example.org\n'
+    assert post_csv(client, auth_headers, body).get_json()['imported'] == 1
+    revision = app_module.event_store.revision
+
+    report = post_csv(client, auth_headers, body).get_json()
+    assert (report['imported'], report['rejected']) == (0, 1)
+    assert app_module.event_store.revision == revision
+
+
+def make_store(tmp_path, events):
+    path = tmp_path / 'events.json'
+    path.write_text(json.dumps(events), encoding='utf-8')
+    store = EventStore(str(path))
+    store.load()
+    return store
+
+
+def test_migration_moves_legacy_participants(tmp_path, events):
+    store = make_store(tmp_path, events)
+    legacy = tmp_path / 'participants.json'
+    legacy.write_text(json.dumps([
+        {'name': 'Anna', 'email': 'anna@example.org', 'event_id': 2,
+         'timestamp': '2024-05-01T10:00:00'},
+        {'name': 'Nobody', 'email': 'nobody@example.org', 'event_id': 9}
+    ]), encoding='utf-8')
+
+    report = migrate_legacy_participants(store, str(legacy))
+    assert (report['migrated'], report['skipped']) == (1, 1)
+    assert store.counts()[2] == 1
+    assert not legacy.exists() and (tmp_path / 'participants.json.migrated').exists()
+
+
+def test_migration_with_nothing_new_writes_nothing(tmp_path, events):
+    events[0]['participants'].append(
+        {'name': 'Anna', 'email': 'anna@example.org', 'timestamp': '2024-05-01T10:00:00'})
+    store = make_store(tmp_path, events)
+    revision = store.revision
+    legacy = tmp_path / 'participants.json'
+    legacy.write_text(json.dumps([{'name': 'Anna', 'email': 'anna@example.org',
+                                   'event_id': 1, 'timestamp': '2024-05-01T10:00:00'}]))
+
+    report = migrate_legacy_participants(store, str(legacy))
+    assert (report['migrated'], report['duplicates']) == (0, 1)
+    assert store.revision == revision
+    assert not legacy.exists()
+
+
+def test_migration_of_a_vanished_file_writes_nothing(tmp_path, events, monkeypatch):
+    store = make_store(tmp_path, events)
+    revision = store.revision
+    legacy = str(tmp_path / 'participants.json')
+    # Another worker renamed the file between the check and the transaction
+    answers = iter([True])
+    monkeypatch.setattr(participants.os.path, 'exists', lambda path: next(answers, False))
+
+    assert migrate_legacy_participants(store, legacy) is None
+    assert store.revision == revision
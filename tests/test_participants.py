@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def registered(app_module, events):
+    """120 participants spread over the four events, one minute apart"""
+    start = datetime(2024, 5, 1)
+    for n in range(120):
+        events[n % 4]['participants'].append({
+            'name': f'Person {n}',
+            'email': f'person{n}@example.org',
+            'message': '',
+            'timestamp': (start + timedelta(minutes=n)).isoformat()
+        })
+    app_module.save_events(events)
+    return [f'Person {n}' for n in range(120)]
+
+
+def test_requires_auth(client):
+    assert client.get('/api/participants').status_code == 401
+
+
+def test_following_next_cursor_returns_everyone_once(client, auth_headers, registered):
+    names, cursor, pages = [], None, 0
+    while True:
+        url = '/api/participants?limit=50' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url, headers=auth_headers).get_json()
+        assert body['count'] == 120
+        names += [p['name'] for p in body['participants']]
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == list(reversed(registered))
+
+
+def test_default_page_points_to_the_next(client, auth_headers, registered):
+    body = client.get('/api/participants', headers=auth_headers).get_json()
+    assert len(body['participants']) == 50
+    assert body['next_cursor'] is not None
+
+
+def test_event_filter(client, auth_headers, registered):
+    body = client.get('/api/participants?event_id=2&limit=500', headers=auth_headers).get_json()
+    assert body['count'] == 30
+    assert {p['event_id'] for p in body['participants']} == {2}
+    assert body['next_cursor'] is None
+
+
+def test_invalid_cursor(client, auth_headers):
+    response = client.get('/api/participants?cursor=not-a-cursor', headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+import pytest
+
+import search
+
+
+@pytest.fixture
+def registered(app_module, events):
+    for n in range(12):
+        events[0]['participants'].append({
+            'name': f'Anna{n:02d} Example', 'email': f'anna{n}@example.org',
+            'message': '', 'timestamp': f'2024-05-01T10:{n:02d}:00'
+        })
+    events[1]['participants'].append({
+        'name': 'Bert', 'email': 'bert@example.org', 'message': 'Anna sent me',
+        'timestamp': '2024-05-01T11:00:00'
+    })
+    app_module.save_events(events)
+
+
+def test_event_search(client, auth_headers, registered):
+    body = client.get('/api/events/1/participants?q=anna&per_page=5',
+                      headers=auth_headers).get_json()
+    assert body['count'] == 12
+    assert body['truncated'] is False
+    assert len(body['participants']) == 5
+    assert all(p['name'].startswith('Anna') for p in body['participants'])
+
+
+def test_event_search_unknown_event(client, auth_headers, app_module, events):
+    app_module.save_events(events[:3])
+    response = client.get('/api/events/4/participants?q=anna', headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_global_search_across_events(client, auth_headers, registered):
+    body = client.get('/api/participants/search?q=anna', headers=auth_headers).get_json()
+    assert body['count'] == 13
+    assert {p['event_id'] for p in body['participants']} == {1, 2}
+
+
+def test_capped_expansion_is_reported(client, auth_headers, registered, monkeypatch):
+    monkeypatch.setattr(search, 'MAX_EXPANSIONS', 3)
+    body = client.get('/api/participants/search?q=anna', headers=auth_headers).get_json()
+    assert body['truncated'] is True
+    assert body['count'] < 13
@@ -0,0 +1,31 @@
+from columns import ParticipantColumns
+
+
+def test_irregular_participants_are_not_shared_between_copies(app_module, events):
+    events[0]['participants'] = [
+        {'name': 'Anna', 'email': 'anna@example.org', 'tags': ['vip']},
+        {'name': 'Bert', 'email': 'bert@example.org', 'message': '',
+         'timestamp': '2024-05-01T10:00:00', 'event_id': 1}
+    ]
+    app_module.save_events(events)
+    # The caller's list is not the cached one either
+    events[0]['participants'][0]['tags'].append('changed-after-save')
+
+    loaded = app_module.load_events()
+    assert isinstance(loaded[0]['participants'], ParticipantColumns)
+    loaded[0]['participants'][0]['name'] = 'Changed'
+    loaded[0]['participants'][0]['tags'].append('changed')
+
+    again = app_module.load_events()[0]['participants']
+    assert again[0] == {'name': 'Anna', 'email': 'anna@example.org', 'tags': ['vip']}
+    assert again[1]['name'] == 'Bert'
+
+
+def test_failed_transaction_is_discarded(app_module):
+    try:
+        with app_module.events_transaction() as events:
+            events[0]['title'] = 'Renamed'
+            raise RuntimeError('abort')
+    except RuntimeError:
+        pass
+    assert app_module.load_events()[0]['title'] == 'Event 1'
@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.fixture
+def broker(app_module):
+    broker = app_module.stream_broker
+    max_clients = broker.max_clients
+    broker.max_clients = 3
+    yield broker
+    broker.max_clients = max_clients
+
+
+def test_head_requests_release_their_slot(client, broker):
+    for _ in range(broker.max_clients + 2):
+        response = client.head('/api/events/stream')
+        assert response.status_code == 200
+        response.close()
+    assert broker.clients == 0
+
+
+def test_get_closed_early_releases_its_slot(client, broker):
+    responses = [client.get('/api/events/stream', buffered=False) for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert broker.clients == 3
+
+    # One started, the others closed before their first message
+    assert next(responses[0].response).startswith(b'retry:')
+    for response in responses:
+        response.close()
+    assert broker.clients == 0
+
+
+def test_full_broker_rejects_until_a_slot_frees(client, broker):
+    responses = [client.get('/api/events/stream', buffered=False) for _ in range(3)]
+    assert client.get('/api/events/stream').status_code == 503
+
+    responses.pop().close()
+    response = client.get('/api/events/stream', buffered=False)
+    assert response.status_code == 200
+    for response in responses + [response]:
+        response.close()
+    assert broker.clients == 0
+
+
+def test_release_is_idempotent(broker):
+    release = broker.reserve()
+    release()
+    release()
+    assert broker.clients == 0
@@ -0,0 +1,38 @@
+from typing import List
+
+import pytest
+
+from translation import FakeBackend, TranslationBackend, translate_with_retry
+
+
+def test_incomplete_backend_fails_on_creation():
+    class Incomplete(TranslationBackend):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_retries_with_backoff():
+    class Flaky(FakeBackend):
+        failures = 2
+
+        def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError('rate limited')
+            return super().translate_batch(texts, source, target)
+
+    delays = []
+    result = translate_with_retry(Flaky(), ['Hallo'], 'de', 'en', sleep=delays.append)
+    assert result == ['[en] Hallo']
+    assert delays == [1.0, 2.0]
+
+
+def test_gives_up_after_retries():
+    class Broken(FakeBackend):
+        def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+            return []
+
+    with pytest.raises(ValueError):
+        translate_with_retry(Broken(), ['Hallo'], 'de', 'en', retries=1, sleep=lambda s: None)
@@ -0,0 +1,115 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from columns import ParticipantColumns, timestamp_to_micros
+from store import StoreChange
+
+# Position in the global listing: (timestamp in epoch microseconds, event_id, rank)
+Position = Tuple[int, int, int]
+
+
+class ParticipantTimeline:
+    """Participants of all events, newest first, kept current by the event store
+
+    Every event keeps the list positions of its participants sorted by
+    timestamp, plus a parallel array of the sorted timestamps. Sign-ups
+    arrive in order and are appended. An out-of-order batch, such as an
+    import of older records, re-sorts that one event. A page is a lazy k-way
+    merge of the per-event sequences, started from the cursor position with
+    one binary search per event, so its cost depends on the page size and
+    not on the number of participants.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._participants: Dict[int, List[Dict]] = {}
+        self._order: Dict[int, array] = {}
+        self._keys: Dict[int, array] = {}
+
+    def on_store_change(self, events: List[Dict],
+                        changes: Optional[List[StoreChange]]):
+        """Event store listener: rebuild on load or reset, append on commit"""
+        with self._lock:
+            self._participants = {e.get('id'): e.get('participants', []) for e in events}
+            if changes is None:
+                self._order, self._keys = {}, {}
+                for event_id in self._participants:
+                    self._rebuild(event_id)
+                return
+
+            for change in changes:
+                keys = self._keys.get(change.event_id)
+                if keys is None or change.reset:
+                    self._rebuild(change.event_id)
+                    continue
+                if not change.added:
+                    continue
+
+                micros = _timestamps(self._participants[change.event_id])
+                first = len(micros) - len(change.added)
+                added = micros[first:]
+                in_order = (not keys or added[0] >= keys[-1]) and all(
+                    a <= b for a, b in zip(added, added[1:]))
+                if in_order:
+                    self._order[change.event_id].extend(range(first, len(micros)))
+                    keys.extend(added)
+                else:
+                    self._rebuild(change.event_id)
+
+    def page(self, cursor: Optional[Position] = None, limit: int = 50,
+             event_id: Optional[int] = None) -> Tuple[List[Tuple[int, Dict]], Optional[Position]]:
+        """Up to limit (event_id, participant) pairs after cursor, and the next cursor"""
+        with self._lock:
+            event_ids = [event_id] if event_id is not None else list(self._keys)
+            sequences = [
+                self._newest_first(eid, self._start(eid, cursor))
+                for eid in event_ids if eid in self._keys
+            ]
+            rows = list(islice(merge(*sequences, reverse=True), limit + 1))
+            participants = [
+                (eid, self._participants[eid][self._order[eid][rank]])
+                for _, eid, rank in rows[:limit]
+            ]
+
+        next_cursor = rows[limit - 1] if len(rows) > limit else None
+        return participants, next_cursor
+
+    def count(self, event_id: Optional[int] = None) -> int:
+        with self._lock:
+            if event_id is not None:
+                return len(self._keys.get(event_id, []))
+            return sum(len(keys) for keys in self._keys.values())
+
+    def _rebuild(self, event_id: int):
+        micros = _timestamps(self._participants.get(event_id, []))
+        # Stable sort keeps registration order among equal timestamps
+        order = sorted(range(len(micros)), key=micros.__getitem__)
+        self._order[event_id] = array('I', order)
+        self._keys[event_id] = array('q', (micros[i] for i in order))
+
+    def _start(self, event_id: int, cursor: Optional[Position]) -> int:
+        """Number of the event's entries that sort before the cursor"""
+        keys = self._keys[event_id]
+        if cursor is None:
+            return len(keys)
+        micros, cursor_event, rank = cursor
+        if event_id < cursor_event:
+            return bisect_right(keys, micros)
+        if event_id > cursor_event:
+            return bisect_left(keys, micros)
+        return min(rank, len(keys))
+
+    def _newest_first(self, event_id: int, stop: int) -> Iterator[Position]:
+        keys = self._keys[event_id]
+        for rank in range(stop - 1, -1, -1):
+            yield keys[rank], event_id, rank
+
+
+def _timestamps(participants) -> array:
+    if isinstance(participants, ParticipantColumns):
+        return participants.timestamps
+    return array('q', (timestamp_to_micros(p.get('timestamp')) for p in participants))
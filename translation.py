@@ -0,0 +1,85 @@
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationBackend(ABC):
+    """A machine translator, called with batches of paragraphs
+
+    max_concurrency bounds the calls in flight across all threads using the
+    same backend instance, so a thread pool cannot exceed a provider's rate
+    limits.
+    """
+
+    name = 'backend'
+    max_concurrency = 4
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        """Translations of texts, in the same order"""
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate through deep_translator"""
+
+    name = 'google'
+    max_concurrency = 4
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        from deep_translator import GoogleTranslator
+        return GoogleTranslator(source=source, target=target).translate_batch(texts)
+
+
+class FakeBackend(TranslationBackend):
+    """Deterministic offline translator for tests and benchmarks
+
+    Returns each text prefixed with the target language, after an optional
+    delay per batch standing in for network latency.
+    """
+
+    name = 'fake'
+    max_concurrency = 8
+
+    def __init__(self, max_concurrency: Optional[int] = None, delay: float = 0.0):
+        super().__init__(max_concurrency)
+        self.delay = delay
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        with self._calls_lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return [f'[{target}] {text}' for text in texts]
+
+
+def translate_with_retry(backend: TranslationBackend, texts: List[str], source: str,
+                         target: str, retries: int = 3, backoff: float = 1.0,
+                         sleep: Callable[[float], None] = time.sleep) -> List[str]:
+    """backend.translate_batch() within its concurrency limit, retried with
+    exponential backoff (backoff, 2 x backoff, ...) on errors"""
+    for attempt in range(retries + 1):
+        try:
+            with backend.slots:
+                translations = backend.translate_batch(texts, source, target)
+            if len(translations) != len(texts):
+                raise ValueError(
+                    f'{backend.name} returned {len(translations)} translations for {len(texts)} texts')
+            return translations
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(f"{backend.name} translation to {target} failed ({e}), "
+                           f"retrying in {delay:.1f}s")
+            sleep(delay)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""SQLite-backed translation memory.
+
+Usage:
+    python -m translation_memory export content/translation_memory.sqlite3 memory.json
+    python -m translation_memory compact content/translation_memory.sqlite3
+"""
+
+import os
+import re
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_KEY = re.compile(r'[0-9a-f]{64}\Z')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_hash TEXT NOT NULL,
+    language TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (source_hash, language)
+) WITHOUT ROWID
+"""
+
+
+class TranslationMemory:
+    """Translations keyed by (SHA-256 of the source paragraph, target language)
+
+    Inserts and lookups are single primary-key operations, so a bulk run no
+    longer rewrites the whole memory per translation. The database runs in
+    WAL mode: readers in other threads and processes are not blocked by a
+    writer. Each thread gets its own connection.
+
+    A legacy translation_memory.json given as legacy_path is imported once
+    and renamed to <path>.migrated. export_json() writes the same format
+    back out.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute(SCHEMA)
+        if legacy_path and os.path.exists(legacy_path):
+            self._import_json(legacy_path)
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def get_many(self, language: str, keys: Iterable[str]) -> Dict[str, str]:
+        """Stored translations for whichever keys are known"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        db = self._connection()
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(db.execute(
+                f'SELECT source_hash, translation FROM translations '
+                f'WHERE language = ? AND source_hash IN ({placeholders})',
+                [language, *chunk]))
+        return found
+
+    def put_many(self, language: str, translations: Iterable[Tuple[str, str]]):
+        now = datetime.now().isoformat()
+        with self._connection() as db:
+            db.executemany(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                ((key, language, text, now) for key, text in translations))
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def export_json(self, path: str) -> int:
+        """Write {language: {source_hash: translation}} like the old JSON memory"""
+        memory: Dict[str, Dict[str, str]] = {}
+        rows = self._connection().execute(
+            'SELECT language, source_hash, translation FROM translations '
+            'ORDER BY language, source_hash')
+        count = 0
+        for language, key, text in rows:
+            memory.setdefault(language, {})[key] = text
+            count += 1
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(memory, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return count
+
+    def compact(self):
+        """Fold the WAL into the database and reclaim free pages"""
+        db = self._connection()
+        db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        db.execute('VACUUM')
+
+    def close(self):
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def _import_json(self, legacy_path: str):
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                memory = json.load(f)
+            imported = 0
+            for language, entries in memory.items():
+                # Entries keyed by the old per-process hash() can never match
+                valid = [(k, v) for k, v in entries.items() if SEGMENT_KEY.match(k)]
+                self.put_many(language, valid)
+                imported += len(valid)
+            os.replace(legacy_path, f'{legacy_path}.migrated')
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Could not import translation memory {legacy_path}: {e}")
+            return
+        logger.info(f"Imported {imported} translations from {legacy_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='write the memory as JSON')
+    export.add_argument('database')
+    export.add_argument('output')
+    compact = commands.add_parser('compact', help='checkpoint and vacuum the database')
+    compact.add_argument('database')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        parser.error(f'{args.database} does not exist')
+    memory = TranslationMemory(args.database)
+    if args.command == 'export':
+        count = memory.export_json(args.output)
+        print(f'[translation_memory] Exported {count} translations to {args.output}')
+    else:
+        before = os.path.getsize(args.database)
+        memory.compact()
+        print(f'[translation_memory] Compacted {args.database}: '
+              f'{before} -> {os.path.getsize(args.database)} bytes')
+    memory.close()
+
+
+if __name__ == '__main__':
+    main()